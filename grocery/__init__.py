@@ -0,0 +1,7 @@
+"""Grocery price scraper and comparison database for Indian delivery platforms
+
+Nothing heavy is imported here: use `from grocery.database import GroceryDatabase`
+or the scraper modules directly.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,5 @@
+import sys
+
+from grocery.cli import main
+
+sys.exit(main())
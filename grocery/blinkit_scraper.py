@@ -1,13 +1,22 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 import time
+from urllib.parse import quote_plus
+
+from grocery import location
+from grocery.cards import parse_card, BLINKIT_SKIP_WORDS
+
+HOME_URL = "https://blinkit.com/"
+SEARCH_URL = "https://blinkit.com/s/?q={query}"
 
 class BlinkitSimpleScraper:
     def __init__(self):
         self.driver = None
+        self.pincode = None  # delivery pincode of this session, recorded on every product
         self.setup_driver()
     
     def setup_driver(self):
@@ -26,7 +35,7 @@ class BlinkitSimpleScraper:
     def open_blinkit(self):
         """Open Blinkit and wait for manual setup"""
         print("🌐 Opening Blinkit...")
-        self.driver.get("https://blinkit.com/")
+        self.driver.get(HOME_URL)
         time.sleep(3)
         
         print("\n" + "="*60)
@@ -45,11 +54,31 @@ class BlinkitSimpleScraper:
         if not product_searched:
             product_searched = "product"  # fallback
         
+        pincode = input("📍 Which pincode did you set? (press Enter to skip): ").strip()
+        if pincode and not location.PINCODE_PATTERN.match(pincode):
+            print(f"⚠️ '{pincode}' is not a 6-digit pincode, products will not be tagged with it")
+            pincode = None
+        self.pincode = pincode or None
+        
         input(f"✅ Press Enter after you've searched for '{product_searched}' and can see the products...")
         print(f"🔍 Now looking for {product_searched} products on the page...")
         
         return product_searched
     
+    def set_pincode(self, pincode, interactive=True):
+        """Set the delivery location of this browser session to pincode (asking the user if the picker fails and interactive)"""
+        # Until the switch is confirmed the session's location is unknown
+        self.pincode = None
+        if not location.set_pincode(self.driver, HOME_URL, pincode, interactive):
+            raise location.LocationNotSetError(f"could not set the delivery location to {pincode}")
+        self.pincode = location.check_pincode(pincode)
+    
+    def search(self, query):
+        """Open the search results page for query directly (location must already be set)"""
+        print(f"🔍 Searching for '{query}'...")
+        self.driver.get(SEARCH_URL.format(query=quote_plus(query)))
+        time.sleep(3)
+    
     def extract_products_simple(self, max_products=None):
         """Simple product extraction using price elements"""
         products = []
@@ -106,24 +135,7 @@ class BlinkitSimpleScraper:
                                 continue
                             
                             # Check if it looks like a product (has name and price)
-                            lines = container_text.split('\n')
-                            
-                            # Extract product name and price
-                            product_name = None
-                            product_price = None
-                            
-                            for line in lines:
-                                line = line.strip()
-                                if '₹' in line and not product_price:
-                                    product_price = line
-                                elif (line and 
-                                      '₹' not in line and 
-                                      'ADD' not in line.upper() and 
-                                      'SAVE' not in line.upper() and
-                                      len(line) > 3 and
-                                      not line.isdigit() and
-                                      not product_name):
-                                    product_name = line
+                            product_name, product_price, _ = parse_card(container_text, BLINKIT_SKIP_WORDS)
                             
                             # If we found both name and price, it's a valid product
                             if product_name and product_price:
@@ -132,7 +144,8 @@ class BlinkitSimpleScraper:
                                     'name': product_name,
                                     'price': product_price,
                                     'full_text': container_text,
-                                    'url': self.driver.current_url
+                                    'url': self.driver.current_url,
+                                    'pincode': self.pincode or ''
                                 }
                                 
                                 products.append(product)
@@ -142,7 +155,8 @@ class BlinkitSimpleScraper:
                                 product_found = True
                                 break
                                 
-                        except Exception:
+                        except (NoSuchElementException, StaleElementReferenceException):
+                            # Container missing or re-rendered; a dead session propagates
                             continue
                     
                     # Stop if we reached the limit
@@ -150,21 +164,24 @@ class BlinkitSimpleScraper:
                         print(f"🛑 Reached limit of {max_products} products")
                         break
                         
-                except Exception as e:
+                except (NoSuchElementException, StaleElementReferenceException):
                     continue
             
             print(f"\n📊 Found {len(products)} total products")
             return products
             
+        except WebDriverException:
+            # Browser/session is gone; let the caller decide whether to restart it
+            raise
         except Exception as e:
             print(f"❌ Error extracting products: {e}")
             return []
     
     def save_results(self, products, product_name, filename=None):
-        """Save results to CSV with dynamic filename"""
+        """Save results to CSV with dynamic filename, returns the filename (None on failure)"""
         if not products:
             print("❌ No products to save")
-            return
+            return None
         
         try:
             # Create filename based on product searched
@@ -195,9 +212,11 @@ class BlinkitSimpleScraper:
             print(f"   Product searched: {product_name}")
             print(f"   File saved: {filename}")
             print(f"   Platform: Blinkit")
+            return filename
             
         except Exception as e:
             print(f"❌ Error saving results: {e}")
+            return None
     
     def run_scraper(self):
         """Main scraper workflow"""
@@ -0,0 +1,174 @@
+"""Product card heuristics shared by the scrapers
+
+A card's text is a handful of lines, e.g. "Amul Taaza Toned Milk\\n500 ml\\n₹27\\n₹29\\nADD":
+the first line with ₹ is the price and the first remaining line that is not a
+button or promo label is the name. The Blinkit/Zepto extractors apply this to
+the DOM container around each price; parse_page_text applies it to a whole
+copied page (or saved HTML page) for Swiggy bulk entry.
+"""
+
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+BLINKIT_SKIP_WORDS = ('ADD', 'SAVE')
+ZEPTO_SKIP_WORDS = ('ADD', 'SAVE', 'OFF', 'MIN')
+
+# "500 ml", "1 kg", "4 x 15 tablets", "2 pieces (300-400 g)", "180 ml X 4"
+SIZE_PATTERN = re.compile(
+    r'^\d+(\.\d+)?\s*(x\s*\d+\s*)?(ml|l|ltr|litres?|liters?|g|gm|gms|kg|pcs?|pieces?|tablets?|packs?|units?|pouch)\b',
+    re.IGNORECASE)
+
+# Lines that end a card in copied page text
+BUTTON_PATTERN = re.compile(r'^(add|add to cart|\+?\s*add\s*\+?)$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _skip_pattern(skip_words):
+    """Regex matching any skip word as a whole token, optionally plural ("10 MINS")"""
+    words = '|'.join(re.escape(word) for word in skip_words)
+    return re.compile(r'\b(?:' + words + r')S?\b')
+
+
+def _has_skip_word(line, skip_words):
+    """Button/promo words as whole words ("48% OFF", "10 MINS", "ADD"), not in names ("Coffee", "Minute Maid")"""
+    return _skip_pattern(tuple(skip_words)).search(line.upper()) is not None
+
+
+def is_name_candidate(line, skip_words=BLINKIT_SKIP_WORDS):
+    """Could this line be a product name?"""
+    return (line and
+            '₹' not in line and
+            not _has_skip_word(line, skip_words) and
+            len(line) > 3 and
+            not line.isdigit())
+
+
+def parse_card(text, skip_words=BLINKIT_SKIP_WORDS):
+    """Return (name, price, size) from a card's text; None for anything not found"""
+    product_name = None
+    product_price = None
+    size = None
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if '₹' in line and not product_price:
+            product_price = line
+        elif not product_name and is_name_candidate(line, skip_words):
+            product_name = line
+        elif product_name and not size and SIZE_PATTERN.match(line):
+            size = line
+
+    return product_name, product_price, size
+
+
+def split_cards(text):
+    """Split copied page text into card texts at "ADD" button lines (blank lines if there are none)"""
+    lines = [line.strip() for line in text.splitlines()]
+    cards = []
+    current = []
+
+    if any(BUTTON_PATTERN.match(line) for line in lines):
+        for line in lines:
+            if not line:
+                continue
+            current.append(line)
+            if BUTTON_PATTERN.match(line):
+                cards.append(current)
+                current = []
+    else:
+        for line in lines:
+            if line:
+                current.append(line)
+            elif current:
+                cards.append(current)
+                current = []
+    if current:
+        cards.append(current)
+    return cards
+
+
+def _trim_card(lines, skip_words):
+    """Drop page text (headers, filters, banners) that precedes a card's name line
+
+    The name is the last name-like line before the first price, skipping the size line.
+    """
+    first_price = next((i for i, line in enumerate(lines) if '₹' in line), None)
+    if first_price is None:
+        return None
+    for i in range(first_price - 1, -1, -1):
+        if is_name_candidate(lines[i], skip_words) and not SIZE_PATTERN.match(lines[i]):
+            return lines[i:]
+    return None
+
+
+def parse_page_text(text, skip_words=ZEPTO_SKIP_WORDS):
+    """Parse a whole copied page into ([{'name', 'price', 'size', 'full_text'}, ...], skipped)
+
+    skipped lists the text of cards that have a price but no recognizable
+    name, so callers can report products that were lost.
+    """
+    products = []
+    skipped = []
+    seen = set()
+
+    for card in split_cards(text):
+        lines = _trim_card(card, skip_words)
+        if not lines:
+            if any('₹' in line for line in card):
+                skipped.append('\n'.join(card))
+            continue
+        full_text = '\n'.join(lines)
+        name, price, size = parse_card(full_text, skip_words)
+        if not (name and price):
+            skipped.append(full_text)
+            continue
+        if (name, price) in seen:
+            continue
+        seen.add((name, price))
+        products.append({
+            'name': name,
+            'price': price,
+            'size': size or 'N/A',
+            'full_text': full_text,
+        })
+
+    return products, skipped
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text from HTML, one line per block element"""
+
+    BLOCK_TAGS = {'div', 'p', 'li', 'br', 'tr', 'td', 'section', 'article', 'button',
+                  'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'footer', 'a'}
+    HIDDEN_TAGS = {'script', 'style', 'noscript', 'svg', 'template'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.HIDDEN_TAGS:
+            self._hidden += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.HIDDEN_TAGS:
+            self._hidden = max(0, self._hidden - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._hidden:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """Visible text of an HTML page with line breaks between block elements"""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    lines = (' '.join(line.split()) for line in ''.join(extractor.parts).splitlines())
+    return '\n'.join(line for line in lines if line)
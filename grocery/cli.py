@@ -0,0 +1,285 @@
+"""`grocery` command line interface (scrape, ingest, query, deals, matrix, export, serve)
+
+Heavy dependencies are imported inside the subcommands that need them:
+selenium only for `scrape`, pandas only for `ingest`, `deals`, `matrix` and
+`export`.
+`grocery query` uses plain sqlite3 so it starts fast enough for cron jobs
+and shell scripts.
+"""
+
+import argparse
+import os
+import sys
+
+from grocery.database import GroceryDatabase
+from grocery.location import PINCODE_PATTERN
+
+DEFAULT_DB = os.environ.get("GROCERY_DB", "grocery_prices.db")
+
+SCRAPERS = {
+    'blinkit': 'grocery.blinkit_scraper',
+    'zepto': 'grocery.zepto_scraper',
+    'swiggy': 'grocery.swiggy_scraper',
+}
+
+
+def _open_existing_db(db_path):
+    """Open db_path for a read-only command; None (after an error) if there is no such file"""
+    # GroceryDatabase would silently create an empty database for a mistyped --db
+    if not os.path.isfile(db_path):
+        print(f"❌ Database not found: {db_path} (load scraper CSVs with `grocery ingest` first)", file=sys.stderr)
+        return None
+    return GroceryDatabase(db_path, verbose=False)
+
+
+def cmd_scrape(args):
+    """Run one of the interactive scrapers, or a checkpointed sweep over many queries"""
+    import importlib
+    
+    if args.import_html:
+        if args.platform != 'swiggy':
+            print("❌ --import-html is only supported for swiggy")
+            return 1
+        from grocery.swiggy_scraper import SwiggyManualScraper
+        
+        products = SwiggyManualScraper(open_browser=False).run_import(args.import_html, args.product or "product")
+        return 0 if products else 1
+    
+    queries = _read_list(args.queries, args.queries_file)
+    pincodes = _read_list(args.pincodes, args.pincodes_file)
+    invalid = [pincode for pincode in pincodes if not PINCODE_PATTERN.match(pincode)]
+    if invalid:
+        print(f"❌ Invalid pincodes (expected 6 digits): {', '.join(invalid)}")
+        return 1
+    if pincodes and not (queries or args.run):
+        print("❌ --pincodes needs --queries (or --run to resume a sweep)")
+        return 1
+    
+    if queries or args.run:
+        from grocery import sweep
+        
+        if args.platform not in sweep.SWEEP_SCRAPERS:
+            print(f"❌ {args.platform} does not support automated sweeps")
+            return 1
+        from datetime import date
+        
+        # One journal per platform per day: rerunning today resumes, tomorrow's run scrapes again
+        journal_path = args.run or f"{args.platform}_run_{date.today().isoformat()}.json"
+        try:
+            journal = sweep.run_sweep(args.platform, queries, journal_path,
+                                      output_dir=args.output_dir, max_attempts=args.max_attempts,
+                                      max_products=args.max_products, pincodes=pincodes)
+        except ImportError as e:
+            print(f"❌ Scraping needs the optional dependencies: pip install 'grocery[scrape]' ({e})")
+            return 1
+        return 0 if all(job['status'] == sweep.DONE for job in journal.jobs) else 1
+    
+    try:
+        scraper = importlib.import_module(SCRAPERS[args.platform])
+        scraper.main()
+    except ImportError as e:
+        print(f"❌ Scraping needs the optional dependencies: pip install 'grocery[scrape]' ({e})")
+        return 1
+    return 0
+
+
+def _read_list(values, path):
+    """Values given on the command line plus the non-empty lines of path"""
+    items = list(values or [])
+    if path:
+        with open(path, encoding='utf-8') as f:
+            items.extend(line.strip() for line in f if line.strip())
+    return items
+
+
+def cmd_ingest(args):
+    """Load scraper CSV files into the database"""
+    import glob
+    
+    csv_files = []
+    for pattern in args.csv_files:
+        csv_files.extend(sorted(glob.glob(pattern)) or [pattern])
+    
+    db = GroceryDatabase(args.db)
+    try:
+        success_count = sum(1 for csv_file in csv_files if db.load_csv_to_database(csv_file))
+    finally:
+        db.close()
+    
+    print(f"\n📊 Successfully loaded {success_count}/{len(csv_files)} files into database")
+    return 0 if success_count == len(csv_files) else 1
+
+
+def cmd_query(args):
+    """Search products by name"""
+    import csv
+    
+    db = _open_existing_db(args.db)
+    if db is None:
+        return 1
+    try:
+        rows = db.query_product_rows(platform=args.platform, search_term=args.search_term,
+                                     min_price=args.min_price, max_price=args.max_price, pincode=args.pincode)
+    finally:
+        db.close()
+    
+    columns = ['platform', 'name', 'price', 'price_numeric', 'size', 'pincode', 'scrape_date']
+    if args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        return 0
+    
+    if not rows:
+        print(f"❌ No products found containing '{args.search_term}'")
+        return 1
+    
+    columns = ['platform', 'name', 'price']
+    widths = {col: max(len(col), *(len(str(row[col])) for row in rows)) for col in columns}
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    for row in rows:
+        print("  ".join(str(row[col]).ljust(widths[col]) for col in columns))
+    return 0
+
+
+def cmd_deals(args):
+    """Show the best deals across platforms"""
+    db = _open_existing_db(args.db)
+    if db is None:
+        return 1
+    try:
+        deals_df = db.find_deals(limit=args.limit, min_platforms=args.min_platforms, pincode=args.pincode)
+    finally:
+        db.close()
+    
+    if deals_df.empty:
+        print("No comparable products found")
+        return 1
+    
+    print(deals_df.to_string(index=False))
+    return 0
+
+
+def cmd_matrix(args):
+    """Show the lowest price of each product at each pincode"""
+    db = _open_existing_db(args.db)
+    if db is None:
+        return 1
+    try:
+        matrix = db.price_matrix(search_term=args.search_term, platform=args.platform, scrape_date=args.date)
+    finally:
+        db.close()
+    
+    if matrix.empty:
+        print("❌ No prices with a pincode found")
+        return 1
+    
+    if args.csv:
+        matrix.to_csv(sys.stdout)
+    else:
+        print(matrix.to_string(na_rep='-'))
+    return 0
+
+
+def cmd_export(args):
+    """Export all products to a CSV file"""
+    from datetime import datetime
+    
+    export_filename = args.output or f"grocery_database_export_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+    
+    db = _open_existing_db(args.db)
+    if db is None:
+        return 1
+    try:
+        all_products = db.get_all_products_df()
+    finally:
+        db.close()
+    
+    if all_products.empty:
+        print("❌ No data to export")
+        return 1
+    
+    all_products.to_csv(export_filename, index=False)
+    print(f"📤 Database exported to: {export_filename}")
+    print(f"📊 Exported {len(all_products)} products")
+    return 0
+
+
+def cmd_serve(args):
+    """Serve price comparisons over HTTP on localhost"""
+    from grocery import server
+    
+    server.run(args.db, host=args.host, port=args.port, pool_size=args.pool_size)
+    return 0
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(prog='grocery', description="Compare grocery prices across delivery platforms")
+    parser.add_argument('--db', default=DEFAULT_DB,
+                        help="SQLite database file (default: $GROCERY_DB or grocery_prices.db)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    scrape = subparsers.add_parser('scrape', help="run an interactive scraper")
+    scrape.add_argument('platform', choices=sorted(SCRAPERS))
+    scrape.add_argument('--queries', nargs='+', metavar='QUERY', help="search these queries unattended")
+    scrape.add_argument('--queries-file', help="file with one query per line")
+    scrape.add_argument('--pincodes', nargs='+', metavar='PINCODE', help="scrape every query at each of these pincodes")
+    scrape.add_argument('--pincodes-file', help="file with one pincode per line")
+    scrape.add_argument('--run', help="run journal to create or resume (default: <platform>_run_<today>.json)")
+    scrape.add_argument('--output-dir', default='.', help="where sweep CSVs are written")
+    scrape.add_argument('--max-attempts', type=int, default=3)
+    scrape.add_argument('--max-products', type=int)
+    scrape.add_argument('--import-html', metavar='FILE', help="swiggy: import a saved results page without a browser")
+    scrape.add_argument('--product', help="swiggy: what the imported page was a search for")
+    scrape.set_defaults(func=cmd_scrape)
+    
+    ingest = subparsers.add_parser('ingest', help="load scraper CSV files into the database")
+    ingest.add_argument('csv_files', nargs='+', metavar='CSV', help="CSV files or glob patterns")
+    ingest.set_defaults(func=cmd_ingest)
+    
+    query = subparsers.add_parser('query', help="search products by name")
+    query.add_argument('search_term')
+    query.add_argument('--platform')
+    query.add_argument('--pincode')
+    query.add_argument('--min-price', type=float)
+    query.add_argument('--max-price', type=float)
+    query.add_argument('--csv', action='store_true', help="write CSV to stdout")
+    query.set_defaults(func=cmd_query)
+    
+    deals = subparsers.add_parser('deals', help="show the best deals across platforms")
+    deals.add_argument('--limit', type=int, default=10)
+    deals.add_argument('--min-platforms', type=int, default=2,
+                       help="only products listed on at least this many platforms")
+    deals.add_argument('--pincode', help="compare prices seen at this pincode only")
+    deals.set_defaults(func=cmd_deals)
+    
+    matrix = subparsers.add_parser('matrix', help="compare prices across pincodes")
+    matrix.add_argument('search_term', nargs='?')
+    matrix.add_argument('--platform')
+    matrix.add_argument('--date', help="scrape date (YYYY-MM-DD, default: the latest)")
+    matrix.add_argument('--csv', action='store_true', help="write CSV to stdout")
+    matrix.set_defaults(func=cmd_matrix)
+    
+    export = subparsers.add_parser('export', help="export all products to CSV")
+    export.add_argument('output', nargs='?')
+    export.set_defaults(func=cmd_export)
+    
+    serve = subparsers.add_parser('serve', help="run the local comparison API server")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--pool-size', type=int, default=4, help="number of pooled read connections")
+    serve.set_defaults(func=cmd_serve)
+    
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the `grocery` command"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Output piped into e.g. `head` that exited early
+        sys.stdout = open(os.devnull, 'w')
+        return 1
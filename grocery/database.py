@@ -0,0 +1,618 @@
+"""SQLite storage and queries for scraped grocery prices"""
+
+import hashlib
+import re
+import sqlite3
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+
+def _unpack_text(data):
+    """Decompress a blobs.data value (registered as the SQL function unpack_text)"""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode('utf-8')
+
+
+def _pandas():
+    """Import pandas on first use so light commands (e.g. `grocery query`) start fast"""
+    import pandas as pd
+    return pd
+
+
+class GroceryDatabase:
+    def __init__(self, db_name="grocery_prices.db", cache_max_entries=128, cache_max_bytes=64 * 1024 * 1024,
+                 verbose=True):
+        self.db_name = db_name
+        self.conn = None
+        self.verbose = verbose
+        
+        # Query result cache (LRU, invalidated by per-platform data versions)
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_bytes = cache_max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._data_versions = {}
+        self._sqlite_data_version = None
+        
+        self.setup_database()
+    
+    def setup_database(self):
+        """Create database and tables"""
+        if self.verbose:
+            print(f"🗄️ Setting up database: {self.db_name}")
+        
+        self.conn = sqlite3.connect(self.db_name)
+        self.conn.create_function('unpack_text', 1, _unpack_text, deterministic=True)
+        cursor = self.conn.cursor()
+        
+        # Create blob table: raw card text and URLs, stored once per distinct value
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                id INTEGER PRIMARY KEY,
+                hash BLOB NOT NULL UNIQUE,
+                data BLOB NOT NULL
+            )
+        ''')
+        
+        # Create main products table (full_text and url live in blobs)
+        self._create_products_table(cursor)
+        
+        # Create platform summary table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS platform_summary (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform TEXT NOT NULL,
+                product_count INTEGER,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(platform)
+            )
+        ''')
+        
+        # Create data version table (bumped per platform on every ingest)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_versions (
+                platform TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        migrated = self._migrate_inline_text(cursor)
+        rebuilt = self._migrate_pincode(cursor)
+        
+        # Create indexes for better performance
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_platform ON products(platform)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON products(name)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_numeric ON products(price_numeric)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pincode ON products(pincode, scrape_date)')
+        cursor.execute('DROP INDEX IF EXISTS idx_listing_date')  # superseded by idx_listing_pincode_date
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_listing_pincode_date
+            ON products(platform, name, pincode, scrape_date, price_numeric)
+        ''')
+        
+        # Products with full_text and url resolved, in the original column order
+        cursor.execute('''
+            CREATE TEMP VIEW IF NOT EXISTS products_expanded AS
+            SELECT p.id, p.platform, p.name, p.price, p.price_numeric, p.size,
+                   unpack_text(ft.data) AS full_text, unpack_text(u.data) AS url,
+                   p.pincode, p.scrape_date, p.created_at
+            FROM products p
+            LEFT JOIN blobs ft ON ft.id = p.full_text_id
+            LEFT JOIN blobs u ON u.id = p.url_id
+        ''')
+        
+        self.conn.commit()
+        if migrated or rebuilt:
+            # Give the space freed by the inline text / old table back to the file system
+            self.conn.execute('VACUUM')
+            if self.verbose and migrated:
+                print(f"📦 Moved full_text/url of {migrated} products into the blobs table")
+            if self.verbose and rebuilt:
+                print(f"📍 Added a pincode column to {rebuilt} existing products")
+        self._refresh_data_versions()
+        if self.verbose:
+            print("✅ Database tables created successfully!")
+    
+    def _create_products_table(self, cursor):
+        """Create the products table (one row per platform/pincode/product/price/day)"""
+        # pincode is '' for observations whose delivery location was not recorded
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform TEXT NOT NULL,
+                name TEXT NOT NULL,
+                price TEXT NOT NULL,
+                price_numeric REAL,
+                size TEXT,
+                full_text_id INTEGER REFERENCES blobs(id),
+                url_id INTEGER REFERENCES blobs(id),
+                pincode TEXT NOT NULL DEFAULT '',
+                scrape_date TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(platform, name, price, scrape_date, pincode)
+            )
+        ''')
+    
+    def _migrate_pincode(self, cursor):
+        """Rebuild a products table created before pincodes were recorded
+        
+        The pincode is part of the UNIQUE constraint, which SQLite can only
+        change by copying the rows into a new table. This also drops the
+        inline full_text/url columns left behind by _migrate_inline_text.
+        The rename, copy and drop run in one transaction; a products_old left
+        behind by an interrupted rebuild is copied over on the next open.
+        """
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(products)').fetchall()}
+        leftover = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_old'").fetchone()
+        if 'pincode' in columns and not leftover:
+            return 0
+        
+        # sqlite3 would autocommit each DDL statement, so open the transaction explicitly
+        if self.conn.in_transaction:
+            self.conn.commit()
+        cursor.execute('BEGIN')
+        try:
+            if not leftover:
+                cursor.execute('ALTER TABLE products RENAME TO products_old')
+            indexes = cursor.execute('''
+                SELECT name FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = 'products_old' AND sql IS NOT NULL
+            ''').fetchall()
+            for (index,) in indexes:
+                cursor.execute(f'DROP INDEX "{index}"')
+            self._create_products_table(cursor)
+            cursor.execute('''
+                INSERT OR IGNORE INTO products
+                (id, platform, name, price, price_numeric, size, full_text_id, url_id, scrape_date, created_at)
+                SELECT id, platform, name, price, price_numeric, size, full_text_id, url_id, scrape_date, created_at
+                FROM products_old
+            ''')
+            rebuilt = cursor.rowcount
+            cursor.execute('DROP TABLE products_old')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        return rebuilt
+    
+    def _store_blob(self, cursor, text):
+        """Store text once in the blobs table and return its id"""
+        if text is None or text != text:  # NaN from pandas
+            return None
+        data = str(text).encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        
+        cursor.execute('SELECT id FROM blobs WHERE hash = ?', (digest,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        cursor.execute('INSERT INTO blobs (hash, data) VALUES (?, ?)', (digest, zlib.compress(data, 9)))
+        return cursor.lastrowid
+    
+    def _migrate_inline_text(self, cursor):
+        """Move full_text/url stored inline by older databases into the blobs table"""
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(products)').fetchall()}
+        if 'full_text_id' not in columns:
+            cursor.execute('ALTER TABLE products ADD COLUMN full_text_id INTEGER REFERENCES blobs(id)')
+            cursor.execute('ALTER TABLE products ADD COLUMN url_id INTEGER REFERENCES blobs(id)')
+        if 'full_text' not in columns:
+            return 0
+        
+        rows = cursor.execute('''
+            SELECT id, full_text, url FROM products
+            WHERE full_text IS NOT NULL OR url IS NOT NULL
+        ''').fetchall()
+        for product_id, full_text, url in rows:
+            cursor.execute('''
+                UPDATE products SET full_text_id = ?, url_id = ?, full_text = NULL, url = NULL
+                WHERE id = ?
+            ''', (self._store_blob(cursor, full_text), self._store_blob(cursor, url), product_id))
+        return len(rows)
+    
+    def _refresh_data_versions(self):
+        """Reload per-platform data versions if another connection wrote to the database"""
+        # PRAGMA data_version only changes when a *different* connection commits,
+        # so this is a cheap check on every cached read
+        sqlite_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        if sqlite_version != self._sqlite_data_version:
+            self._sqlite_data_version = sqlite_version
+            rows = self.conn.execute('SELECT platform, version FROM data_versions').fetchall()
+            self._data_versions = dict(rows)
+        return self._data_versions
+    
+    def _bump_data_versions(self, cursor, platforms):
+        """Increment the data version of every platform touched by an ingest"""
+        for platform in platforms:
+            cursor.execute('''
+                INSERT INTO data_versions (platform, version) VALUES (?, 1)
+                ON CONFLICT(platform) DO UPDATE SET version = version + 1
+            ''', (platform,))
+            cursor.execute('SELECT version FROM data_versions WHERE platform = ?', (platform,))
+            self._data_versions[platform] = cursor.fetchone()[0]
+    
+    def _cached(self, method, params, platforms, loader):
+        """Return a cached DataFrame for (method, params) or build it with loader()
+        
+        platforms is the tuple of platforms the result depends on, or None for
+        queries over all platforms. An entry is reused only while the data
+        versions of those platforms are unchanged.
+        """
+        versions = self._refresh_data_versions()
+        if platforms is None:
+            snapshot = tuple(sorted(versions.items()))
+        else:
+            snapshot = tuple((p, versions.get(p, 0)) for p in platforms)
+        
+        key = (method, params)
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] == snapshot:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return entry[1].copy()
+            del self._cache[key]
+            self._cache_bytes -= entry[2]
+        
+        self.cache_misses += 1
+        result = loader()
+        size = int(result.memory_usage(deep=True).sum())
+        if size <= self.cache_max_bytes:
+            self._cache[key] = (snapshot, result, size)
+            self._cache_bytes += size
+            while self._cache and (len(self._cache) > self.cache_max_entries
+                                   or self._cache_bytes > self.cache_max_bytes):
+                _, (_, _, evicted_size) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted_size
+        
+        # Callers are free to modify what they get back, so never hand out the cached object
+        return result.copy()
+    
+    def clear_cache(self):
+        """Drop all cached query results"""
+        self._cache.clear()
+        self._cache_bytes = 0
+    
+    def cache_info(self):
+        """Get query cache statistics"""
+        return {
+            'entries': len(self._cache),
+            'bytes': self._cache_bytes,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+        }
+    
+    def extract_price_numeric(self, price_str):
+        """Extract numeric price from price string"""
+        if price_str is None or _pandas().isna(price_str):
+            return None
+        
+        price_str = str(price_str)
+        numbers = re.findall(r'[\d,]+\.?\d*', price_str)
+        
+        if numbers:
+            price = numbers[0].replace(',', '')
+            try:
+                return float(price)
+            except ValueError:
+                return None
+        return None
+    
+    def clean_product_data(self, df):
+        """Clean and standardize product data"""
+        df = df.copy()
+        
+        # Ensure required columns exist
+        required_columns = ['platform', 'name', 'price']
+        for col in required_columns:
+            if col not in df.columns:
+                print(f"⚠️ Missing required column: {col}")
+                return None
+        
+        # Clean data
+        df['name'] = df['name'].astype(str).str.strip()
+        df['price'] = df['price'].astype(str).str.strip()
+        df['platform'] = df['platform'].astype(str).str.strip()
+        
+        # Extract numeric price
+        df['price_numeric'] = df['price'].apply(self.extract_price_numeric)
+        
+        # Add optional columns if they don't exist
+        if 'size' not in df.columns:
+            df['size'] = 'N/A'
+        if 'full_text' not in df.columns:
+            df['full_text'] = df['name']
+        if 'url' not in df.columns:
+            df['url'] = 'N/A'
+        
+        # Delivery pincode the prices were seen at ('' when it was not recorded)
+        if 'pincode' not in df.columns:
+            df['pincode'] = ''
+        df['pincode'] = df['pincode'].fillna('').astype(str).str.strip()
+        
+        # Add scrape date
+        df['scrape_date'] = datetime.now().strftime('%Y-%m-%d')
+        
+        # Remove rows with invalid data
+        df = df.dropna(subset=['name', 'price'])
+        df = df[df['name'] != '']
+        df = df[df['price'] != '']
+        
+        return df
+    
+    def load_csv_to_database(self, csv_file):
+        """Load a single CSV file into the database"""
+        try:
+            print(f"📄 Loading: {csv_file}")
+            
+            # Read CSV
+            df = _pandas().read_csv(csv_file, dtype={'pincode': str})
+            print(f"   Raw data: {len(df)} rows")
+            
+            # Clean data
+            df_clean = self.clean_product_data(df)
+            if df_clean is None:
+                print("   ❌ Failed to clean data")
+                return False
+            
+            print(f"   Clean data: {len(df_clean)} rows")
+            
+            if len(df_clean) == 0:
+                print("   ⚠️ No valid data to insert")
+                return False
+            
+            # Insert data
+            cursor = self.conn.cursor()
+            inserted_count = 0
+            touched_platforms = set()
+            
+            for _, row in df_clean.iterrows():
+                try:
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO products 
+                        (platform, name, price, price_numeric, size, full_text_id, url_id, pincode, scrape_date)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (row['platform'], row['name'], row['price'], row['price_numeric'], 
+                          row['size'], self._store_blob(cursor, row['full_text']),
+                          self._store_blob(cursor, row['url']), row['pincode'], row['scrape_date']))
+                    
+                    if cursor.rowcount > 0:
+                        inserted_count += 1
+                        touched_platforms.add(row['platform'])
+                
+                except Exception as e:
+                    print(f"   Error inserting row: {e}")
+                    continue
+            
+            # Invalidate cached query results for the platforms that changed
+            self._bump_data_versions(cursor, sorted(touched_platforms))
+            self.conn.commit()
+            print(f"   ✅ Inserted: {inserted_count} new products")
+            return True
+            
+        except Exception as e:
+            print(f"   ❌ Error loading {csv_file}: {e}")
+            return False
+    
+    def get_all_products_df(self):
+        """Get all products as DataFrame"""
+        query = "SELECT * FROM products_expanded ORDER BY platform, name"
+        return self._cached('get_all_products_df', (), None,
+                            lambda: _pandas().read_sql_query(query, self.conn))
+    
+    def query_products(self, platform=None, search_term=None, min_price=None, max_price=None, pincode=None):
+        """Query products with filters"""
+        # Normalize parameters so equivalent calls share one cache entry
+        platform = platform.strip() if platform and platform.strip() else None
+        pincode = str(pincode).strip() if pincode and str(pincode).strip() else None
+        search_term = search_term.strip() if search_term and search_term.strip() else None
+        if search_term and search_term.isascii():
+            search_term = search_term.lower()  # LIKE is case-insensitive for ASCII
+        min_price = float(min_price) if min_price else None
+        max_price = float(max_price) if max_price else None
+        
+        params = (platform, search_term, min_price, max_price, pincode)
+        platforms = (platform,) if platform else None
+        return self._cached('query_products', params, platforms,
+                            lambda: self._query_products(*params))
+    
+    def _query_products(self, platform, search_term, min_price, max_price, pincode):
+        """Run the filtered products query"""
+        query, params = self._products_query_sql(platform, search_term, min_price, max_price, pincode)
+        return _pandas().read_sql_query(query, self.conn, params=params)
+    
+    def query_product_rows(self, platform=None, search_term=None, min_price=None, max_price=None, pincode=None):
+        """Query products with filters, as a list of dicts (no pandas needed)"""
+        query, params = self._products_query_sql(platform, search_term, min_price, max_price, pincode)
+        cursor = self.conn.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def _products_query_sql(self, platform, search_term, min_price, max_price, pincode=None):
+        """Build the SQL and parameters for a filtered products query"""
+        query = "SELECT * FROM products_expanded WHERE 1=1"
+        params = []
+        
+        if platform:
+            query += " AND platform = ?"
+            params.append(platform)
+        
+        if search_term:
+            query += " AND name LIKE ?"
+            params.append(f"%{search_term}%")
+        
+        if min_price:
+            query += " AND price_numeric >= ?"
+            params.append(min_price)
+        
+        if max_price:
+            query += " AND price_numeric <= ?"
+            params.append(max_price)
+        
+        if pincode:
+            query += " AND pincode = ?"
+            params.append(str(pincode))
+        
+        query += " ORDER BY platform, name"
+        
+        return query, params
+    
+    def get_platform_summary(self):
+        """Get platform summary statistics"""
+        query = '''
+            SELECT platform, 
+                   COUNT(*) as product_count,
+                   MIN(price_numeric) as min_price, 
+                   MAX(price_numeric) as max_price,
+                   AVG(price_numeric) as avg_price,
+                   COUNT(DISTINCT scrape_date) as scrape_sessions
+            FROM products 
+            WHERE price_numeric IS NOT NULL
+            GROUP BY platform
+            ORDER BY product_count DESC
+        '''
+        return self._cached('get_platform_summary', (), None,
+                            lambda: _pandas().read_sql_query(query, self.conn))
+    
+    def find_deals(self, limit=10, min_platforms=2, pincode=None):
+        """Compare prices of every product listed on at least min_platforms platforms
+        
+        Each listing contributes its lowest price on its latest scrape date
+        (at pincode, if given), and each product its cheapest listing per
+        platform, so the spread is between platforms rather than over time.
+        Listings are matched on their normalized name (lower case, punctuation
+        removed) and aggregated in one vectorized pass. Returns the `limit`
+        products with the highest savings percent (all of them if limit is None).
+        """
+        limit = int(limit) if limit is not None else None
+        pincode = str(pincode).strip() if pincode and str(pincode).strip() else None
+        params = (limit, int(min_platforms), pincode)
+        return self._cached('find_deals', params, None, lambda: self._find_deals(*params))
+    
+    def _find_deals(self, limit, min_platforms, pincode=None):
+        """Build the deals table (see find_deals)"""
+        pd = _pandas()
+        import numpy as np
+        
+        columns = ['Product', 'Platforms', 'Listings', 'Min Price', 'Max Price', 'Savings',
+                   'Savings %', 'Best Platform', 'Worst Platform']
+        # Current price of every listing: its lowest price on its latest scrape date.
+        # One pass over idx_listing_pincode_date: MAX() of a (date, inverted price) key picks
+        # that row, and SQLite takes the bare price_numeric column from the row holding the MAX
+        listings = pd.read_sql_query(f'''
+            SELECT platform, name, price_numeric
+            FROM (
+                SELECT platform, name, price_numeric,
+                       MAX(COALESCE(scrape_date, '') || printf('%020.6f', 1e9 - price_numeric))
+                FROM products
+                WHERE price_numeric IS NOT NULL {"AND pincode = ?" if pincode else ""}
+                GROUP BY platform, name
+            )
+        ''', self.conn, params=[pincode] if pincode else [])
+        if listings.empty:
+            return pd.DataFrame(columns=columns)
+        
+        # Normalize each distinct name once, then work on integer product/platform codes
+        name_codes, names = pd.factorize(listings['name'])
+        normalized = pd.Series(names).str.lower().str.replace(r'[^\w\s]', '', regex=True)
+        key_codes, keys = pd.factorize(normalized)
+        product = key_codes[name_codes]
+        platform_codes, platforms = pd.factorize(listings['platform'])
+        platforms = np.asarray(platforms)
+        n_products = len(keys)
+        
+        # products x platforms presence matrix (there are only a handful of platforms)
+        on_platform = np.stack([np.bincount(product[platform_codes == p], minlength=n_products) > 0
+                                for p in range(len(platforms))], axis=1)
+        
+        # Cheapest listing of each product on each platform: sort by (product, platform, price)
+        # and keep the first row of every (product, platform) pair
+        price = listings['price_numeric'].to_numpy()
+        pair = product * len(platforms) + platform_codes
+        order = np.lexsort((price, pair))
+        first = np.concatenate(([True], pair[order][1:] != pair[order][:-1]))
+        per_platform = order[first]
+        
+        # Group labels are 0..n_products-1, so every aggregate lines up with on_platform
+        prices = pd.Series(price[per_platform], index=per_platform).groupby(product[per_platform], sort=True)
+        stats = pd.DataFrame({
+            'listings': np.bincount(product, minlength=n_products),
+            'platform_count': on_platform.sum(axis=1),
+            'min_price': prices.min().to_numpy(),
+            'max_price': prices.max().to_numpy(),
+            'best_row': prices.idxmin().to_numpy(),
+            'worst_row': prices.idxmax().to_numpy(),
+        })
+        stats = stats[stats['platform_count'] >= min_platforms]
+        savings = stats['max_price'] - stats['min_price']
+        stats['savings'] = savings
+        stats['savings_percent'] = np.where(stats['max_price'] > 0, savings / stats['max_price'] * 100, 0.0)
+        
+        # Numeric top-k selection instead of sorting everything
+        if limit is None:
+            top = stats.sort_values('savings_percent', ascending=False, kind='stable')
+        else:
+            top = stats.nlargest(limit, 'savings_percent')
+        
+        best_rows = top['best_row'].to_numpy()
+        worst_rows = top['worst_row'].to_numpy()
+        return pd.DataFrame({
+            'Product': listings['name'].to_numpy()[best_rows],
+            'Platforms': [', '.join(platforms[present]) for present in on_platform[top.index.to_numpy()]],
+            'Listings': top['listings'].to_numpy(),
+            'Min Price': top['min_price'].to_numpy(),
+            'Max Price': top['max_price'].to_numpy(),
+            'Savings': top['savings'].to_numpy(),
+            'Savings %': top['savings_percent'].round(1).to_numpy(),
+            'Best Platform': platforms[platform_codes[best_rows]],
+            'Worst Platform': platforms[platform_codes[worst_rows]],
+        }, columns=columns)
+    
+    def price_matrix(self, search_term=None, platform=None, scrape_date=None):
+        """Lowest price of each listing at each pincode
+        
+        One row per (platform, name), one column per pincode, NaN where the
+        product was not seen at that pincode. Uses the most recent scrape date
+        with pincode data unless scrape_date is given.
+        """
+        platform = platform.strip() if platform and platform.strip() else None
+        search_term = search_term.strip().lower() if search_term and search_term.strip() else None
+        scrape_date = str(scrape_date) if scrape_date else None
+        params = (search_term, platform, scrape_date)
+        return self._cached('price_matrix', params, (platform,) if platform else None,
+                            lambda: self._price_matrix(*params))
+    
+    def _price_matrix(self, search_term, platform, scrape_date):
+        """Build the pincode price matrix (see price_matrix)"""
+        filters = "price_numeric IS NOT NULL AND pincode != ''"
+        params = []
+        if platform:
+            filters += " AND platform = ?"
+            params.append(platform)
+        if search_term:
+            filters += " AND name LIKE ?"
+            params.append(f"%{search_term}%")
+        
+        if scrape_date is None:
+            row = self.conn.execute(f"SELECT MAX(scrape_date) FROM products WHERE {filters}", params).fetchone()
+            scrape_date = row[0]
+        
+        observations = _pandas().read_sql_query(f'''
+            SELECT platform, name, pincode, MIN(price_numeric) AS price
+            FROM products
+            WHERE {filters} AND scrape_date = ?
+            GROUP BY platform, name, pincode
+        ''', self.conn, params=params + [scrape_date])
+        matrix = observations.pivot(index=['platform', 'name'], columns='pincode', values='price')
+        matrix.columns.name = None
+        return matrix.sort_index(axis=1)
+    
+    def close(self):
+        """Close database connection"""
+        self.clear_cache()
+        if self.conn:
+            self.conn.close()
@@ -0,0 +1,125 @@
+"""Setting the delivery pincode of a scraper's browser session
+
+Blinkit and Zepto price (and stock) products per dark store, so a scrape is
+only meaningful together with the location it was made from. set_pincode
+points a session at a pincode without a human: open the location picker,
+type the pincode and pick the suggestion for it, then check that the page
+header now shows that pincode or area. The sites change their markup often,
+so the XPaths are deliberately generic and, when they stop matching, the user
+is asked to set the location in the browser instead.
+
+Selenium is imported inside the functions so the CLI can validate pincodes
+without the [scrape] extra installed.
+"""
+
+import re
+import time
+
+PINCODE_PATTERN = re.compile(r'^\d{6}$')
+
+_LOWER = "translate({}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+# Header element that opens the location picker (and shows the current location)
+PICKER_XPATHS = [
+    f"//*[contains({_LOWER.format('@aria-label')}, 'location')]",
+    "//*[contains(text(), 'Delivery in') or contains(text(), 'Select Location') or contains(text(), 'Select location')]",
+]
+
+# Search box inside the picker
+INPUT_XPATHS = [
+    f"//input[contains({_LOWER.format('@placeholder')}, 'pincode')]",
+    f"//input[contains({_LOWER.format('@placeholder')}, 'location')]",
+    f"//input[contains({_LOWER.format('@placeholder')}, 'area')]",
+]
+
+
+class LocationNotSetError(RuntimeError):
+    """The site did not switch to the requested delivery location"""
+
+
+def check_pincode(pincode):
+    """Return pincode as a 6-digit string, ValueError if it is not one"""
+    pincode = str(pincode).strip()
+    if not PINCODE_PATTERN.match(pincode):
+        raise ValueError(f"invalid pincode {pincode!r} (expected 6 digits)")
+    return pincode
+
+
+def _layout_errors():
+    """Errors that mean "the page does not look like we expected" rather than "the browser is gone\""""
+    from selenium.common.exceptions import (ElementNotInteractableException, NoSuchElementException,
+                                            StaleElementReferenceException)
+    return NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException
+
+
+def _find_first(driver, xpaths):
+    """First displayed element matching any of xpaths"""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    for xpath in xpaths:
+        for element in driver.find_elements(By.XPATH, xpath):
+            if element.is_displayed():
+                return element
+    raise NoSuchElementException(f"none of {xpaths} is visible")
+
+
+def _header_text(driver):
+    """Text of the page header / location bar"""
+    from selenium.webdriver.common.by import By
+
+    texts = [element.text for xpath in ["//header"] + PICKER_XPATHS
+             for element in driver.find_elements(By.XPATH, xpath)]
+    return ' '.join(texts).lower()
+
+
+def _pick_location(driver, pincode):
+    """Type pincode into the location picker and choose its suggestion, returns the area chosen"""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    try:
+        location_input = _find_first(driver, INPUT_XPATHS)
+    except NoSuchElementException:
+        _find_first(driver, PICKER_XPATHS).click()
+        time.sleep(2)
+        location_input = _find_first(driver, INPUT_XPATHS)
+
+    location_input.clear()
+    location_input.send_keys(pincode)
+    time.sleep(3)
+
+    # Only a suggestion that names the pincode is trusted; the first suggestion may be anywhere
+    suggestion = _find_first(driver, [f"//*[contains(text(), '{pincode}') and not(self::input)]"])
+    area = suggestion.text.split(',')[0].strip()
+    suggestion.click()
+    time.sleep(3)
+    return area
+
+
+def set_pincode(driver, home_url, pincode, interactive=True):
+    """Point the session's delivery location at pincode, returns True once it is set
+
+    Raises LocationNotSetError when the header does not show the chosen
+    pincode or area afterwards. Browser crashes (any other
+    WebDriverException) propagate so a sweep can restart Chrome.
+    """
+    pincode = check_pincode(pincode)
+    driver.get(home_url)
+    time.sleep(3)
+
+    try:
+        area = _pick_location(driver, pincode)
+    except _layout_errors() as e:
+        print(f"⚠️ Could not set pincode {pincode} automatically ({e.__class__.__name__})")
+    else:
+        header = _header_text(driver)
+        if pincode not in header and (not area or area.lower() not in header):
+            raise LocationNotSetError(f"page header does not show {pincode} after choosing '{area}'")
+        print(f"📍 Delivery location set to {pincode} ({area})")
+        return True
+
+    if not interactive:
+        return False
+    input(f"📍 Set the delivery location to pincode {pincode} in the browser, then press Enter...")
+    return True
@@ -0,0 +1,400 @@
+"""Local HTTP API for price comparisons (`grocery serve`)
+
+Endpoints (all GET, JSON):
+    /search?q=milk&platform=&pincode=&min_price=&max_price=&limit=&cursor=
+    /history?name=Amul Taaza Toned Milk&platform=&pincode=&limit=&cursor=
+    /compare?q=milk&pincode=
+    /deals?limit=10&pincode=
+
+Pure asyncio + sqlite3, no extra dependencies. Reads run on a small pool of
+read-only connections in worker threads. Whole responses are cached in memory
+against the database's per-platform data versions (see GroceryDatabase), so
+repeated lookups are answered straight from the event loop and every ETag
+changes as soon as an ingest touches the data.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import queue
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from grocery.database import GroceryDatabase
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+GZIP_MIN_BYTES = 512
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+
+
+class BadRequest(ValueError):
+    """Invalid query parameters (answered with 400)"""
+
+
+class ReadPool:
+    """Fixed pool of read-only SQLite connections shared by worker threads"""
+
+    def __init__(self, db_name, size=4):
+        uri = Path(db_name).resolve().as_uri() + '?mode=ro'
+        self._connections = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._connections.put(conn)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+def _encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor, length):
+    """Decode a next_cursor value back into its `length` keyset values"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise BadRequest("invalid cursor")
+    if (not isinstance(values, list) or len(values) != length
+            or not all(isinstance(value, (str, int, float)) for value in values)):
+        raise BadRequest("invalid cursor")
+    return values
+
+
+def _param(params, name, cast=str, default=None):
+    values = params.get(name)
+    if not values or values[0] == '':
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise BadRequest(f"invalid value for {name}")
+
+
+def _page_size(params, default=DEFAULT_PAGE_SIZE):
+    limit = _param(params, 'limit', int, default)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+class ComparisonServer:
+    """Serve GroceryDatabase lookups over HTTP on localhost"""
+
+    def __init__(self, db_name="grocery_prices.db", pool_size=4, response_cache_size=1024):
+        # Creating a GroceryDatabase makes sure the schema (and data_versions) exists.
+        # It is only ever used from its own single thread.
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='grocery-db')
+        self._db = self._db_executor.submit(GroceryDatabase, db_name, verbose=False).result()
+
+        self.pool = ReadPool(db_name, pool_size)
+        self._read_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='grocery-read')
+
+        # Version checks happen on the event loop thread with this connection
+        self._version_conn = sqlite3.connect(Path(db_name).resolve().as_uri() + '?mode=ro', uri=True)
+        self._sqlite_data_version = None
+        self._version_token = None
+
+        self._responses = OrderedDict()
+        self._response_cache_size = response_cache_size
+
+        self.routes = {
+            '/search': (self._read_executor, self.search),
+            '/history': (self._read_executor, self.history),
+            '/compare': (self._read_executor, self.compare),
+            '/deals': (self._db_executor, self.deals),
+        }
+
+    def version_token(self):
+        """Short token that changes whenever any platform's data version changes"""
+        sqlite_version = self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+        if sqlite_version != self._sqlite_data_version:
+            self._sqlite_data_version = sqlite_version
+            rows = self._version_conn.execute(
+                'SELECT platform, version FROM data_versions ORDER BY platform').fetchall()
+            self._version_token = hashlib.sha1(repr(rows).encode()).hexdigest()[:16]
+        return self._version_token
+
+    # --- endpoint handlers (run in worker threads) ---
+
+    def search(self, params):
+        """Products whose name contains q, paginated by (platform, name, id)"""
+        search_term = _param(params, 'q')
+        if not search_term:
+            raise BadRequest("missing q")
+        limit = _page_size(params)
+
+        query = '''
+            SELECT id, platform, name, price, price_numeric, size, pincode, scrape_date
+            FROM products WHERE name LIKE ?
+        '''
+        args = [f"%{search_term}%"]
+
+        platform = _param(params, 'platform')
+        if platform:
+            query += " AND platform = ?"
+            args.append(platform)
+        pincode = _param(params, 'pincode')
+        if pincode:
+            query += " AND pincode = ?"
+            args.append(pincode)
+        min_price = _param(params, 'min_price', float)
+        if min_price is not None:
+            query += " AND price_numeric >= ?"
+            args.append(min_price)
+        max_price = _param(params, 'max_price', float)
+        if max_price is not None:
+            query += " AND price_numeric <= ?"
+            args.append(max_price)
+
+        cursor = _param(params, 'cursor')
+        if cursor:
+            query += " AND (platform, name, id) > (?, ?, ?)"
+            args.extend(_decode_cursor(cursor, 3))
+
+        query += " ORDER BY platform, name, id LIMIT ?"
+        args.append(limit + 1)
+
+        with self.pool.connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, args)]
+        return self._page(rows, limit, lambda row: [row['platform'], row['name'], row['id']])
+
+    def history(self, params):
+        """Price observations for one product name, oldest first"""
+        name = _param(params, 'name')
+        if not name:
+            raise BadRequest("missing name")
+        limit = _page_size(params)
+
+        query = '''
+            SELECT id, platform, price, price_numeric, size, pincode, scrape_date
+            FROM products WHERE name = ?
+        '''
+        args = [name]
+
+        platform = _param(params, 'platform')
+        if platform:
+            query += " AND platform = ?"
+            args.append(platform)
+        pincode = _param(params, 'pincode')
+        if pincode:
+            query += " AND pincode = ?"
+            args.append(pincode)
+
+        cursor = _param(params, 'cursor')
+        if cursor:
+            query += " AND (scrape_date, id) > (?, ?)"
+            args.extend(_decode_cursor(cursor, 2))
+
+        query += " ORDER BY scrape_date, id LIMIT ?"
+        args.append(limit + 1)
+
+        with self.pool.connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, args)]
+        result = self._page(rows, limit, lambda row: [row['scrape_date'], row['id']])
+        result['name'] = name
+        return result
+
+    def compare(self, params):
+        """Per-platform price statistics for products matching q"""
+        search_term = _param(params, 'q')
+        if not search_term:
+            raise BadRequest("missing q")
+
+        # Rank listings by price within each platform; rank 1 is the cheapest product.
+        # (A bare `name` next to MIN() is unreliable once MAX() is in the same SELECT.)
+        query = '''
+            WITH matches AS (
+                SELECT platform, name, price_numeric,
+                       ROW_NUMBER() OVER (PARTITION BY platform ORDER BY price_numeric, name) AS price_rank
+                FROM products
+                WHERE name LIKE ? AND price_numeric IS NOT NULL {pincode_filter}
+            )
+            SELECT platform,
+                   COUNT(*) AS product_count,
+                   MIN(price_numeric) AS min_price,
+                   MAX(CASE WHEN price_rank = 1 THEN name END) AS cheapest_product,
+                   MAX(price_numeric) AS max_price,
+                   ROUND(AVG(price_numeric), 2) AS avg_price
+            FROM matches
+            GROUP BY platform
+            ORDER BY min_price
+        '''
+        args = [f"%{search_term}%"]
+        pincode = _param(params, 'pincode')
+        if pincode:
+            args.append(pincode)
+        query = query.format(pincode_filter="AND pincode = ?" if pincode else "")
+        with self.pool.connection() as conn:
+            platforms = [dict(row) for row in conn.execute(query, args)]
+        return {'q': search_term, 'pincode': pincode, 'platforms': platforms}
+
+    def deals(self, params):
+        """Best deals across platforms (runs on the GroceryDatabase thread)"""
+        limit = _page_size(params, default=10)
+        deals_df = self._db.find_deals(limit=limit, pincode=_param(params, 'pincode'))
+        return {'deals': json.loads(deals_df.to_json(orient='records', force_ascii=False))}
+
+    @staticmethod
+    def _page(rows, limit, cursor_key):
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(cursor_key(rows[-1]))
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    # --- HTTP plumbing ---
+
+    async def respond(self, target, accept_gzip, if_none_match):
+        """Return (status, headers, body) for a GET of target"""
+        token = self.version_token()
+
+        cached = self._responses.get(target)
+        if cached is not None and cached[0] == token:
+            self._responses.move_to_end(target)
+        else:
+            cached = None
+
+        if cached is None:
+            url = urlsplit(target)
+            route = self.routes.get(url.path)
+            if route is None:
+                return self._error(404, f"unknown path {url.path}")
+            executor, handler = route
+            params = parse_qs(url.query)
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(executor, handler, params)
+            except BadRequest as e:
+                return self._error(400, str(e))
+
+            body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+            gzip_body = gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+            etag = '"%s-%s"' % (token, hashlib.sha1(body).hexdigest()[:12])
+            cached = (token, etag, body, gzip_body)
+            self._responses[target] = cached
+            while len(self._responses) > self._response_cache_size:
+                self._responses.popitem(last=False)
+
+        _, etag, body, gzip_body = cached
+        use_gzip = accept_gzip and gzip_body is not None
+        if use_gzip:
+            etag = etag[:-1] + '-gz"'  # distinct tag per representation
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return 304, headers, b''
+
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        if use_gzip:
+            headers['Content-Encoding'] = 'gzip'
+            body = gzip_body
+        return 200, headers, body
+
+    @staticmethod
+    def _error(status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests (with keep-alive) on one connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              if version == 'HTTP/1.1'
+                              else headers.get('connection', '').lower() == 'keep-alive')
+
+                if method not in ('GET', 'HEAD'):
+                    status, response_headers, body = self._error(405, f"method {method} not allowed")
+                else:
+                    try:
+                        status, response_headers, body = await self.respond(
+                            target,
+                            'gzip' in headers.get('accept-encoding', ''),
+                            headers.get('if-none-match'))
+                    except Exception as e:
+                        print(f"❌ Error serving {target}: {e}")
+                        status, response_headers, body = self._error(500, "internal error")
+
+                head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                        f"Date: {formatdate(usegmt=True)}",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head.extend(f"{key}: {value}" for key, value in response_headers.items())
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🌐 Serving grocery comparisons on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self._read_executor.shutdown()
+        self._db_executor.submit(self._db.close).result()
+        self._db_executor.shutdown()
+        self.pool.close()
+        self._version_conn.close()
+
+
+def run(db_name="grocery_prices.db", host='127.0.0.1', port=8765, pool_size=4):
+    """Run the comparison server until interrupted"""
+    server = ComparisonServer(db_name, pool_size=pool_size)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n⏹️ Server stopped")
+    finally:
+        server.close()
@@ -0,0 +1,197 @@
+"""Checkpointed scrape runs over many queries (`grocery scrape blinkit --queries ...`)
+
+A run journal (a JSON file) records every job, its status, attempt count and
+output CSV. It is rewritten atomically after each state change, so when the
+process is killed or Chrome crashes, running the same command again skips the
+finished jobs and carries on with the rest. A journal whose jobs are all done
+scrapes nothing, so `grocery scrape` uses one journal per day by default.
+
+With pincodes, every query is scraped at every pincode. Jobs are run grouped
+by pincode so each location is set once on the browser session and then
+reused (warm cookies, cache and dark store) for all its queries.
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from grocery.location import check_pincode
+
+# platform -> (module, scraper class)
+SWEEP_SCRAPERS = {
+    'blinkit': ('grocery.blinkit_scraper', 'BlinkitSimpleScraper'),
+    'zepto': ('grocery.zepto_scraper', 'ZeptoScraper'),
+}
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _slug(text):
+    clean = "".join(c for c in text if c.isalnum() or c in (' ', '-', '_')).strip()
+    return clean.replace(' ', '_').lower()
+
+
+class RunJournal:
+    """On-disk record of a scrape run's jobs and their progress"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.created_at = state['created_at']
+            self.jobs = state['jobs']
+            # A job still marked running was interrupted mid-way: it is retried
+            for job in self.jobs:
+                if job['status'] == RUNNING:
+                    job['status'] = PENDING
+        else:
+            self.created_at = _now()
+            self.jobs = []
+
+    def save(self):
+        """Write the journal atomically (temp file + rename)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.journal-', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': self.created_at, 'jobs': self.jobs}, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def add_jobs(self, platform, queries, output_dir, pincodes=None):
+        """Add a job per query (per pincode and query with pincodes); jobs already in the journal are kept"""
+        known = {job['id'] for job in self.jobs}
+        for pincode in pincodes or [None]:
+            for query in queries:
+                if pincode:
+                    job_id = f"{platform}:{pincode}:{query}"
+                    filename = f"{platform}_{pincode}_{_slug(query)}_results.csv"
+                else:
+                    job_id = f"{platform}:{query}"
+                    filename = f"{platform}_{_slug(query)}_results.csv"
+                if job_id in known:
+                    continue
+                self.jobs.append({
+                    'id': job_id,
+                    'platform': platform,
+                    'pincode': pincode,
+                    'query': query,
+                    'status': PENDING,
+                    'attempts': 0,
+                    'output': os.path.join(output_dir, filename),
+                    'product_count': None,
+                    'error': None,
+                    'updated_at': _now(),
+                })
+                known.add(job_id)
+        self.save()
+
+    def pending_jobs(self, platform, max_attempts):
+        """Jobs on platform that still need to run (failed ones only while attempts remain)"""
+        return [job for job in self.jobs
+                if job['platform'] == platform
+                and job['status'] in (PENDING, FAILED) and job['attempts'] < max_attempts]
+
+    def mark(self, job, status, **fields):
+        job.update(fields, status=status, updated_at=_now())
+        self.save()
+
+    def summary(self):
+        counts = {}
+        for job in self.jobs:
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
+
+
+def _next_job(jobs, pincode):
+    """Pick the next job: fewest attempts first (retry failures last), the session's pincode first"""
+    fewest = min(job['attempts'] for job in jobs)
+    candidates = [job for job in jobs if job['attempts'] == fewest]
+    return next((job for job in candidates if job.get('pincode') == pincode), candidates[0])
+
+
+def run_sweep(platform, queries, journal_path, output_dir='.', max_attempts=3, max_products=None,
+              pincodes=None):
+    """Scrape every query on platform (at every pincode), resuming from journal_path if it exists"""
+    import importlib
+    from selenium.common.exceptions import WebDriverException
+
+    module_name, class_name = SWEEP_SCRAPERS[platform]
+    module = importlib.import_module(module_name)
+    scraper_class = getattr(module, class_name)
+
+    journal = RunJournal(journal_path)
+    pincodes = [check_pincode(pincode) for pincode in pincodes or []]
+    journal.add_jobs(platform, queries, output_dir, pincodes)
+    os.makedirs(output_dir, exist_ok=True)
+
+    done = sum(1 for job in journal.jobs if job['status'] == DONE)
+    print(f"📒 Run journal: {journal_path} ({done} done, "
+          f"{len(journal.pending_jobs(platform, max_attempts))} to run)")
+    if journal.jobs and done == len(journal.jobs):
+        print(f"⚠️ Every job in {journal_path} is already done, nothing will be scraped. "
+              f"Use a new --run journal to scrape these queries again.")
+
+    scraper = None
+    try:
+        # Keep going until every job is done or out of attempts
+        while True:
+            jobs = journal.pending_jobs(platform, max_attempts)
+            if not jobs:
+                break
+            job = _next_job(jobs, scraper.pincode if scraper else None)
+            pincode = job.get('pincode')  # journals from before pincodes have none
+
+            if scraper is None:
+                scraper = scraper_class()
+                if not pincode:
+                    scraper.driver.get(module.HOME_URL)
+                    time.sleep(3)
+                    input(f"📍 Set your delivery location on {platform.capitalize()} in the browser, then press Enter...")
+
+            journal.mark(job, RUNNING, attempts=job['attempts'] + 1, error=None)
+            try:
+                if pincode and scraper.pincode != pincode:
+                    # Once per pincode: the warmed session is reused for all of its queries.
+                    # Never prompt here, an unattended sweep would wait forever: the job fails instead
+                    scraper.set_pincode(pincode, interactive=False)
+
+                scraper.search(job['query'])
+                products = scraper.extract_products_simple(max_products)
+                if not products:
+                    raise RuntimeError("no products found")
+                if scraper.save_results(products, job['query'], filename=job['output']) is None:
+                    raise RuntimeError(f"could not write {job['output']}")
+            except WebDriverException as e:
+                journal.mark(job, FAILED, error=f"browser error: {e.msg or e}")
+                print(f"💥 Browser failed on '{job['query']}', restarting Chrome")
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
+                scraper = None
+                continue
+            except Exception as e:
+                journal.mark(job, FAILED, error=str(e))
+                print(f"❌ '{job['query']}' failed: {e}")
+                continue
+
+            journal.mark(job, DONE, product_count=len(products))
+    finally:
+        if scraper is not None:
+            scraper.close()
+
+    summary = journal.summary()
+    print(f"\n📈 Run summary: {summary}")
+    return journal
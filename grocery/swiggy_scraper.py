@@ -1,16 +1,32 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
+import os
 import time
 
+from grocery.cards import html_to_text, parse_page_text
+from grocery.location import PINCODE_PATTERN
+
+# entry_method recorded on each product -> label shown in the summary
+ENTRY_METHODS = {
+    'Manual': 'Manual Entry',
+    'Bulk': 'Bulk Import',
+    'HTML': 'Saved Page Import',
+}
+
 class SwiggyManualScraper:
-    def __init__(self):
+    def __init__(self, open_browser=True):
         self.driver = None
-        self.setup_driver()
+        self.pincode = None  # delivery pincode of this session, recorded on every product
+        self._pincode_asked = False
+        if open_browser:
+            self.setup_driver()
     
     def setup_driver(self):
         """Setup Chrome driver"""
+        # Imported here so saved-page imports work without the [scrape] extra
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+        
         print("🚀 Setting up Chrome driver for Swiggy manual extraction...")
         
         options = webdriver.ChromeOptions()
@@ -22,6 +38,62 @@ class SwiggyManualScraper:
         self.driver.maximize_window()
         print("✅ Chrome ready!")
     
+    def current_url(self):
+        """URL of the page in the browser ('N/A' when importing without one)"""
+        return self.driver.current_url if self.driver else 'N/A'
+    
+    def ask_pincode(self):
+        """Ask once per session which pincode the Swiggy location is set to"""
+        if self._pincode_asked:
+            return self.pincode
+        self._pincode_asked = True
+        
+        pincode = input("📍 Which pincode is your Swiggy location set to? (press Enter to skip): ").strip()
+        if pincode and not PINCODE_PATTERN.match(pincode):
+            print(f"⚠️ '{pincode}' is not a 6-digit pincode, products will not be tagged with it")
+            pincode = None
+        self.pincode = pincode or None
+        return self.pincode
+    
+    def bulk_import(self, text, url=None, entry_method='Bulk'):
+        """Parse a whole copied Swiggy page (or its HTML text) into products"""
+        products, skipped = parse_page_text(text)
+        for product in products:
+            product['platform'] = 'Swiggy Instamart'
+            product['url'] = url or self.current_url()
+            product['entry_method'] = entry_method
+            product['pincode'] = self.pincode or ''
+        print(f"📋 Parsed {len(products)} products from the page")
+        if skipped:
+            print(f"⚠️ Skipped {len(skipped)} cards with a price but no recognizable name:")
+            for card in skipped:
+                print(f"   - {' | '.join(card.splitlines())[:80]}")
+        return products
+    
+    def import_html_file(self, html_file):
+        """Parse a saved Swiggy page (File > Save Page As...)"""
+        if not os.path.isfile(html_file):
+            print(f"❌ File not found: {html_file}")
+            return []
+        with open(html_file, encoding='utf-8', errors='replace') as f:
+            text = html_to_text(f.read())
+        return self.bulk_import(text, url=html_file, entry_method='HTML')
+    
+    def read_pasted_text(self):
+        """Read a pasted block of page text until a line with END (or end of input)"""
+        print("📋 Select all on the Swiggy results page (Ctrl/Cmd+A), copy, paste here,")
+        print("   then type END on its own line and press Enter:")
+        lines = []
+        while True:
+            try:
+                line = input()
+            except EOFError:
+                break
+            if line.strip() == 'END':
+                break
+            lines.append(line)
+        return '\n'.join(lines)
+    
     def open_swiggy_and_extract(self):
         """Open Swiggy and do manual product entry"""
         print("🌐 Opening Swiggy Instamart...")
@@ -39,6 +111,19 @@ class SwiggyManualScraper:
         product_type = input("🔍 What product are you looking for? (e.g., milk, bread): ").strip()
         if not product_type:
             product_type = "product"
+        self.ask_pincode()
+        
+        print("\nHow do you want to enter products?")
+        print("1. Paste the copied page text (fastest)")
+        print("2. Load a saved HTML page")
+        print("3. Type products one by one")
+        method = input("Your choice (1-3): ").strip()
+        
+        if method == '1':
+            return self.bulk_import(self.read_pasted_text()), product_type
+        if method == '2':
+            html_file = input("Path to the saved .html file: ").strip()
+            return self.import_html_file(html_file), product_type
         
         print(f"\n📋 Now manually enter the {product_type} products you see on Swiggy:")
         print("For each product, enter the name and price.")
@@ -70,8 +155,9 @@ class SwiggyManualScraper:
                 'name': name,
                 'price': price,
                 'size': size if size else 'N/A',
-                'url': self.driver.current_url,
-                'entry_method': 'Manual'
+                'url': self.current_url(),
+                'entry_method': 'Manual',
+                'pincode': self.pincode or ''
             }
             
             products.append(product)
@@ -88,10 +174,9 @@ class SwiggyManualScraper:
         print(f"\n📋 You entered {len(products)} products:")
         print("-" * 60)
         
-        for i, product in enumerate(products, 1):
-            print(f"{i}. {product['name']} - {product['price']}")
-            if product['size'] != 'N/A':
-                print(f"   Size: {product['size']}")
+        review_df = pd.DataFrame(products)[['name', 'price', 'size']]
+        review_df.index = range(1, len(products) + 1)
+        print(review_df.to_string())
         
         print("-" * 60)
         
@@ -133,8 +218,9 @@ class SwiggyManualScraper:
                         'name': name,
                         'price': price,
                         'size': size if size else 'N/A',
-                        'url': self.driver.current_url,
-                        'entry_method': 'Manual'
+                        'url': self.current_url(),
+                        'entry_method': 'Manual',
+                        'pincode': self.pincode or ''
                     }
                     
                     products.append(product)
@@ -213,13 +299,16 @@ class SwiggyManualScraper:
             # Create filename
             clean_name = "".join(c for c in product_type if c.isalnum() or c in (' ', '-', '_')).strip()
             clean_name = clean_name.replace(' ', '_').lower()
-            filename = f"swiggy_instamart_{clean_name}_manual_results.csv"
+            methods = list(dict.fromkeys(p.get('entry_method', 'Manual') for p in products))
+            method_label = ' + '.join(ENTRY_METHODS.get(m, m) for m in methods)
+            method_slug = methods[0].lower() if len(methods) == 1 else 'mixed'
+            filename = f"swiggy_instamart_{clean_name}_{method_slug}_results.csv"
             
             df = pd.DataFrame(products)
             
             # Display results
             print("\n" + "="*80)
-            print(f"🎉 SWIGGY INSTAMART {product_type.upper()} PRODUCTS (MANUAL ENTRY)")
+            print(f"🎉 SWIGGY INSTAMART {product_type.upper()} PRODUCTS ({method_label.upper()})")
             print("="*80)
             
             # Show clean results
@@ -240,7 +329,7 @@ class SwiggyManualScraper:
             print(f"   Product type: {product_type}")
             print(f"   File saved: {filename}")
             print(f"   Platform: Swiggy Instamart")
-            print(f"   Method: Manual Entry")
+            print(f"   Method: {method_label}")
             
         except Exception as e:
             print(f"❌ Error saving results: {e}")
@@ -267,6 +356,22 @@ class SwiggyManualScraper:
             print(f"❌ Error in manual scraper: {e}")
             return []
     
+    def run_import(self, html_file, product_type):
+        """Import a saved HTML page without a browser: parse, review, save"""
+        if not os.path.isfile(html_file):
+            print(f"❌ File not found: {html_file}")
+            return []
+        
+        self.ask_pincode()
+        products = self.import_html_file(html_file)
+        if not products:
+            print("❌ No products found in the page")
+            return []
+        
+        products = self.verify_products(products)
+        self.save_results(products, product_type)
+        return products
+    
     def close(self):
         """Close browser"""
         if self.driver:
@@ -0,0 +1,66 @@
+"""Load test for `grocery serve`
+
+    python scripts/loadtest.py http://127.0.0.1:8765/search?q=milk --requests 20000 --connections 32
+
+Sends keep-alive GET requests over several connections and reports requests/s
+and latency percentiles. Target: a few thousand requests/s on one core for
+cached lookups (the same URL repeated).
+"""
+
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+async def worker(host, port, target, count, latencies, gzip):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f"GET {target} HTTP/1.1\r\nHost: {host}\r\n"
+               + ("Accept-Encoding: gzip\r\n" if gzip else "")
+               + "\r\n").encode('latin-1')
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not status_line.startswith(b'HTTP/1.1 200'):
+                raise RuntimeError(f"unexpected response: {status_line!r}")
+    finally:
+        writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the grocery comparison API")
+    parser.add_argument('url')
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--gzip', action='store_true', help="send Accept-Encoding: gzip")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    target = url.path + ('?' + url.query if url.query else '')
+    per_connection = args.requests // args.connections
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(url.hostname, url.port or 80, target, per_connection, latencies, args.gzip)
+                           for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"📊 {len(latencies)} requests in {elapsed:.2f}s = {len(latencies) / elapsed:.0f} req/s")
+    for pct in (50, 90, 99):
+        print(f"   p{pct}: {latencies[int(len(latencies) * pct / 100) - 1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
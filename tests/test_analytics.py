@@ -0,0 +1,105 @@
+"""PriceAnalytics windows checked against pandas time-based rolling"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grocery.analytics import PriceAnalytics
+from grocery.database import GroceryDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database with irregular daily scrapes: 6 listings x 240 days, gaps and same-day repeats"""
+    rng = np.random.default_rng(0)
+    db = GroceryDatabase(str(tmp_path / 'prices.db'), verbose=False)
+    rows = []
+    listings = [(platform, name, pincode)
+                for platform, name in [('Blinkit', 'Milk'), ('Zepto', 'Milk'), ('Blinkit', 'Bread')]
+                for pincode in ('141001', '110001')]
+    for platform, name, pincode in listings:
+        for day in pd.date_range('2025-01-01', periods=240):
+            if rng.random() < 0.3:
+                continue  # skipped scrape
+            for price in rng.integers(10, 100, size=rng.integers(1, 3)):
+                rows.append((platform, name, f"₹{price}", float(price), pincode, day.strftime('%Y-%m-%d')))
+    db.conn.executemany('''
+        INSERT OR IGNORE INTO products (platform, name, price, price_numeric, pincode, scrape_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    db.conn.commit()
+    yield db
+    db.close()
+
+
+def test_rolling_stats_match_pandas(db):
+    stats = PriceAnalytics(db).rolling_stats()
+    products = pd.read_sql_query('SELECT platform, name, pincode, scrape_date, price_numeric FROM products', db.conn)
+    products['scrape_date'] = pd.to_datetime(products['scrape_date'])
+
+    mismatches = 0
+    for (platform, name, pincode), group in products.groupby(['platform', 'name', 'pincode']):
+        daily = group.groupby('scrape_date')['price_numeric'].min().sort_index()
+        ours = stats[(stats['platform'] == platform) & (stats['name'] == name)
+                     & (stats['pincode'] == pincode)].set_index('scrape_date')
+        assert list(ours.index) == list(daily.index)
+        assert np.array_equal(ours['price'].to_numpy(), daily.to_numpy())
+
+        for days in (7, 30, 90):
+            window = daily.rolling(f'{days}D')
+            expected = {
+                f'min_{days}d': window.min(),
+                f'median_{days}d': window.median(),
+                f'volatility_{days}d': window.std(ddof=0).fillna(0),
+                f'observations_{days}d': window.count(),
+            }
+            for column, values in expected.items():
+                mismatches += int((~np.isclose(ours[column].to_numpy(dtype=float), values.to_numpy())).sum())
+            mismatches += int((ours[f'is_lowest_{days}d'].to_numpy()
+                               != (daily <= window.min()).to_numpy()).sum())
+    assert len(stats) > 1000
+    assert mismatches == 0
+
+
+def test_latest_stats_one_row_per_listing(db):
+    latest = PriceAnalytics(db).latest_stats()
+    assert len(latest) == 6
+    assert not latest.duplicated(['platform', 'name', 'pincode']).any()
+
+
+def test_empty_database(tmp_path):
+    db = GroceryDatabase(str(tmp_path / 'empty.db'), verbose=False)
+    try:
+        stats = PriceAnalytics(db).rolling_stats()
+    finally:
+        db.close()
+    assert stats.empty
+    assert stats['price'].dtype == float
+
+
+def test_volatility_precision_in_a_large_batch(tmp_path):
+    """Paise prices, large values earlier in the batch: a constant price still has no volatility"""
+    rng = np.random.default_rng(1)
+    db = GroceryDatabase(str(tmp_path / 'prices.db'), verbose=False)
+    days = [day.strftime('%Y-%m-%d') for day in pd.date_range('2025-01-01', periods=120)]
+    rows = [('Blinkit', f'Ghee {i:04d}', round(float(price), 2), '141001', day)
+            for i in range(400) for day, price in zip(days, rng.uniform(2000, 9000, size=len(days)))]
+    rows += [('Zepto', 'Maggi', 49.99, '141001', day) for day in days]
+    rows += [('Zepto', 'Parle G', round(float(price), 2), '141001', day)
+             for day, price in zip(days, rng.uniform(9.5, 10.5, size=len(days)))]
+    db.conn.executemany('''
+        INSERT INTO products (platform, name, price, price_numeric, pincode, scrape_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(platform, name, f"₹{price}", price, pincode, day) for platform, name, price, pincode, day in rows])
+    db.conn.commit()
+    try:
+        stats = PriceAnalytics(db).rolling_stats()
+    finally:
+        db.close()
+
+    constant = stats[stats['name'] == 'Maggi']
+    assert (constant[['volatility_7d', 'volatility_30d', 'volatility_90d']].to_numpy() < 1e-9).all()
+
+    small = stats[stats['name'] == 'Parle G'].set_index('scrape_date')
+    expected = small['price'].rolling('30D').std(ddof=0).fillna(0)
+    assert np.allclose(small['volatility_30d'], expected, rtol=0, atol=1e-9)
@@ -0,0 +1,123 @@
+"""GroceryDatabase query cache: hits, invalidation on ingest and eviction"""
+
+import pytest
+
+from grocery.database import GroceryDatabase
+
+
+def _csv(tmp_path, filename, rows):
+    path = tmp_path / filename
+    path.write_text('platform,name,price,pincode\n'
+                    + ''.join(f'{platform},{name},₹{price},141001\n' for platform, name, price in rows),
+                    encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Database file with a few Blinkit and Zepto milk listings"""
+    path = str(tmp_path / 'prices.db')
+    db = GroceryDatabase(path, verbose=False)
+    assert db.load_csv_to_database(_csv(tmp_path, 'milk_results.csv', [
+        ('Blinkit', 'Amul Taaza Toned Milk', 27),
+        ('Blinkit', 'Amul Gold Milk', 34),
+        ('Zepto', 'Amul Taaza Toned Milk', 26),
+    ]))
+    db.close()
+    return path
+
+
+def test_repeated_call_is_a_hit(path):
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        first = db.query_products(search_term='milk')
+        first.loc[:, 'name'] = 'changed by the caller'
+        second = db.query_products(search_term='  MILK ')  # normalized to the same key
+        info = db.cache_info()
+    finally:
+        db.close()
+
+    assert info['hits'] == 1 and info['misses'] == 1 and info['entries'] == 1
+    assert 'changed by the caller' not in set(second['name'])
+
+
+def test_ingest_from_another_connection_invalidates(path, tmp_path):
+    reader = GroceryDatabase(path, verbose=False)
+    writer = GroceryDatabase(path, verbose=False)
+    try:
+        before = reader.query_products(platform='Blinkit')
+        assert writer.load_csv_to_database(_csv(tmp_path, 'butter_results.csv', [
+            ('Blinkit', 'Amul Butter', 58),
+        ]))
+        # Only PRAGMA data_version tells the reader that another connection committed
+        after = reader.query_products(platform='Blinkit')
+        info = reader.cache_info()
+    finally:
+        writer.close()
+        reader.close()
+
+    assert len(after) == len(before) + 1
+    assert 'Amul Butter' in set(after['name'])
+    assert info['hits'] == 0 and info['misses'] == 2
+
+
+def test_platform_entry_survives_ingest_for_another_platform(path, tmp_path):
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        blinkit = db.query_products(platform='Blinkit')
+        everything = db.query_products()
+        assert db.load_csv_to_database(_csv(tmp_path, 'zepto_results.csv', [
+            ('Zepto', 'Amul Butter', 56),
+        ]))
+        assert db.query_products(platform='Blinkit').equals(blinkit)
+        assert db.cache_info()['hits'] == 1
+        # Results over all platforms depend on Zepto too
+        assert len(db.query_products()) == len(everything) + 1
+        info = db.cache_info()
+    finally:
+        db.close()
+
+    assert info['hits'] == 1 and info['misses'] == 3
+
+
+def test_eviction_by_entries(path):
+    db = GroceryDatabase(path, verbose=False, cache_max_entries=2)
+    try:
+        db.query_products(platform='Blinkit')
+        db.query_products(platform='Zepto')
+        db.query_products(platform='Blinkit')  # now the most recently used
+        db.query_products(search_term='gold')  # evicts Zepto
+        assert db.cache_info()['entries'] == 2
+        db.query_products(platform='Blinkit')
+        db.query_products(platform='Zepto')
+        info = db.cache_info()
+    finally:
+        db.close()
+
+    assert info['hits'] == 2 and info['misses'] == 4
+
+
+def test_eviction_by_bytes(path):
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        db.query_products(platform='Blinkit')
+        size = db.cache_info()['bytes']
+        db.clear_cache()
+
+        db.cache_max_bytes = size + size // 2  # room for one result of this size, not two
+        db.query_products(platform='Blinkit')
+        db.query_products(search_term='taaza')  # evicts the older Blinkit entry
+        info = db.cache_info()
+        assert info['entries'] == 1 and info['bytes'] <= db.cache_max_bytes
+        db.query_products(search_term='taaza')
+        assert db.cache_info()['hits'] == 1
+
+        # A result larger than the whole budget is returned but not cached
+        db.clear_cache()
+        db.cache_max_bytes = 1
+        assert len(db.query_products()) == 3
+        info = db.cache_info()
+    finally:
+        db.close()
+
+    assert info['entries'] == 0 and info['bytes'] == 0
@@ -0,0 +1,92 @@
+"""Card heuristics on copied Swiggy pages and saved HTML"""
+
+from grocery.cards import ZEPTO_SKIP_WORDS, _trim_card, html_to_text, parse_page_text, split_cards
+
+# Select-all / copy of a results page: page chrome first, delivery-time badges
+# above names, a promo label between size and price, and a card without a name
+PASTED_PAGE = '''Swiggy Instamart
+Search results for "juice"
+Filters
+Sort
+
+10 MINS
+Minute Maid Pulpy Orange Juice
+1 L
+₹99
+₹120
+ADD
+10 MINS
+Mint Tea Lemon Green Tea
+25 pieces
+₹150
+ADD
+Addictive Offerings Cold Coffee
+180 ml
+48% OFF
+₹45
+₹87
+ADD
+10 MINS
+20% OFF
+₹30
+ADD
+'''
+
+SAVED_PAGE = '''<html><head><title>Instamart</title><style>.card { color: red }</style></head>
+<body><header>Swiggy Instamart</header>
+<script>window.__STATE__ = {"price": "₹1"}</script>
+<div class="card"><div>Amul Taaza   Toned Milk</div><div>500 ml</div><div>₹27</div><button>ADD</button></div>
+<div class="card"><div>Amul Gold Milk</div><div>500 ml</div><div><span>₹</span><span>34</span></div><button>ADD</button></div>
+</body></html>'''
+
+
+def test_split_cards_at_add_buttons():
+    cards = split_cards(PASTED_PAGE)
+    assert len(cards) == 4
+    assert all(card[-1] == 'ADD' for card in cards)
+    assert cards[0][:2] == ['Swiggy Instamart', 'Search results for "juice"']
+    assert cards[3] == ['10 MINS', '20% OFF', '₹30', 'ADD']
+
+
+def test_split_cards_at_blank_lines_without_buttons():
+    assert split_cards('Amul Gold Milk\n₹34\n\n\nAmul Taaza Toned Milk\n₹27\n') == [
+        ['Amul Gold Milk', '₹34'], ['Amul Taaza Toned Milk', '₹27']]
+
+
+def test_trim_card_drops_page_text_before_the_name():
+    first, *_ = split_cards(PASTED_PAGE)
+    assert _trim_card(first, ZEPTO_SKIP_WORDS) == ['Minute Maid Pulpy Orange Juice', '1 L', '₹99', '₹120', 'ADD']
+    # Only a delivery badge and a promo label before the price: no name to keep
+    assert _trim_card(['10 MINS', '20% OFF', '₹30', 'ADD'], ZEPTO_SKIP_WORDS) is None
+    assert _trim_card(['Amul Gold Milk', 'ADD'], ZEPTO_SKIP_WORDS) is None
+
+
+def test_parse_page_text_keeps_names_starting_with_skip_words():
+    products, skipped = parse_page_text(PASTED_PAGE)
+    assert [(p['name'], p['price'], p['size']) for p in products] == [
+        ('Minute Maid Pulpy Orange Juice', '₹99', '1 L'),
+        ('Mint Tea Lemon Green Tea', '₹150', '25 pieces'),
+        ('Addictive Offerings Cold Coffee', '₹45', '180 ml'),
+    ]
+    assert products[2]['full_text'] == 'Addictive Offerings Cold Coffee\n180 ml\n48% OFF\n₹45\n₹87\nADD'
+    assert skipped == ['10 MINS\n20% OFF\n₹30\nADD']
+
+
+def test_parse_page_text_drops_repeated_cards():
+    products, _ = parse_page_text(PASTED_PAGE + PASTED_PAGE)
+    assert len(products) == 3
+
+
+def test_html_to_text_skips_scripts_and_styles():
+    text = html_to_text(SAVED_PAGE)
+    assert 'window.__STATE__' not in text and 'color: red' not in text
+    assert text.splitlines()[:5] == ['Instamart', 'Swiggy Instamart', 'Amul Taaza Toned Milk', '500 ml', '₹27']
+
+
+def test_saved_page_parses_like_a_pasted_one():
+    products, skipped = parse_page_text(html_to_text(SAVED_PAGE))
+    assert [(p['name'], p['price'], p['size']) for p in products] == [
+        ('Amul Taaza Toned Milk', '₹27', '500 ml'),
+        ('Amul Gold Milk', '₹34', '500 ml'),
+    ]
+    assert skipped == []
@@ -0,0 +1,13 @@
+"""Command line entry point"""
+
+import pytest
+
+from grocery.cli import main
+
+
+@pytest.mark.parametrize('command', [['query', 'milk'], ['deals'], ['matrix'], ['export']])
+def test_read_only_commands_need_an_existing_database(tmp_path, capsys, command):
+    path = tmp_path / 'missing.db'
+    assert main(['--db', str(path)] + command) == 1
+    assert 'Database not found' in capsys.readouterr().err
+    assert not path.exists()
@@ -0,0 +1,215 @@
+"""Schema migrations of GroceryDatabase for files written by older versions"""
+
+import sqlite3
+
+import pytest
+
+from grocery.database import GroceryDatabase
+
+# products as created before full_text/url moved to the blobs table
+INLINE_TEXT_SCHEMA = '''
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        name TEXT NOT NULL,
+        price TEXT NOT NULL,
+        price_numeric REAL,
+        size TEXT,
+        full_text TEXT,
+        url TEXT,
+        scrape_date TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(platform, name, price, scrape_date)
+    );
+    CREATE INDEX idx_platform ON products(platform);
+    CREATE INDEX idx_name ON products(name);
+    CREATE INDEX idx_price_numeric ON products(price_numeric);
+'''
+
+LEGACY_ROWS = [
+    ('Blinkit', 'Amul Taaza Toned Milk', '₹27', 27.0, '500 ml', 'Amul Taaza Toned Milk\n500 ml\n₹27\nADD',
+     'https://blinkit.com/s/?q=milk', '2025-06-14'),
+    ('Blinkit', 'Amul Gold Milk', '₹34', 34.0, '500 ml', 'Amul Gold Milk\n500 ml\n₹34\nADD',
+     'https://blinkit.com/s/?q=milk', '2025-06-14'),
+    ('Zepto', 'Amul Taaza Toned Milk', '₹26', 26.0, 'N/A', None, None, '2025-06-15'),
+]
+
+
+def _legacy_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(INLINE_TEXT_SCHEMA)
+    conn.executemany('''
+        INSERT INTO products (platform, name, price, price_numeric, size, full_text, url, scrape_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', LEGACY_ROWS)
+    conn.commit()
+    conn.close()
+
+
+def test_inline_text_moves_to_blobs(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    _legacy_database(path)
+
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        products = db.get_all_products_df().sort_values('id')
+        columns = {row[1] for row in db.conn.execute('PRAGMA table_info(products)')}
+        blobs = db.conn.execute('SELECT COUNT(*) FROM blobs').fetchone()[0]
+    finally:
+        db.close()
+
+    # Rows without text keep none (NULL comes back from pandas as NaN)
+    assert list(products['full_text'].fillna('')) == [row[5] or '' for row in LEGACY_ROWS]
+    assert list(products['url'].fillna('')) == [row[6] or '' for row in LEGACY_ROWS]
+    assert 'full_text' not in columns and 'url' not in columns
+    assert blobs == 3  # two card texts, one URL shared by both Blinkit rows
+
+
+def test_reopening_migrated_database_is_a_no_op(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    _legacy_database(path)
+    GroceryDatabase(path, verbose=False).close()
+
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        assert len(db.get_all_products_df()) == len(LEGACY_ROWS)
+        assert db.conn.execute('SELECT COUNT(*) FROM blobs').fetchone()[0] == 3
+    finally:
+        db.close()
+
+
+# blobs layout from before pincodes were recorded
+NO_PINCODE_SCHEMA = '''
+    CREATE TABLE blobs (
+        id INTEGER PRIMARY KEY,
+        hash BLOB NOT NULL UNIQUE,
+        data BLOB NOT NULL
+    );
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        name TEXT NOT NULL,
+        price TEXT NOT NULL,
+        price_numeric REAL,
+        size TEXT,
+        full_text_id INTEGER REFERENCES blobs(id),
+        url_id INTEGER REFERENCES blobs(id),
+        scrape_date TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(platform, name, price, scrape_date)
+    );
+    CREATE INDEX idx_platform ON products(platform);
+    CREATE INDEX idx_listing_date ON products(platform, name, scrape_date, price_numeric);
+'''
+
+
+def _no_pincode_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(NO_PINCODE_SCHEMA)
+    conn.executemany('''
+        INSERT INTO products (platform, name, price, price_numeric, size, scrape_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [row[:5] + row[7:] for row in LEGACY_ROWS])
+    conn.commit()
+    conn.close()
+
+
+def _tables(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conn.close()
+
+
+def test_pincode_migration_keeps_rows(tmp_path):
+    path = str(tmp_path / 'old.db')
+    _no_pincode_database(path)
+
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        products = db.get_all_products_df()
+        indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        # The same observation at another pincode is a new row
+        db.conn.execute('''
+            INSERT INTO products (platform, name, price, price_numeric, scrape_date, pincode)
+            VALUES ('Zepto', 'Amul Taaza Toned Milk', '₹26', 26.0, '2025-06-15', '141001')
+        ''')
+    finally:
+        db.close()
+
+    assert len(products) == len(LEGACY_ROWS)
+    assert set(products['pincode']) == {''}
+    assert 'idx_listing_pincode_date' in indexes and 'idx_listing_date' not in indexes
+    assert 'products_old' not in _tables(path)
+
+
+def test_interrupted_pincode_migration_rolls_back(tmp_path, monkeypatch):
+    path = str(tmp_path / 'old.db')
+    _no_pincode_database(path)
+
+    create_products_table = GroceryDatabase._create_products_table
+
+    def crash(self, cursor):
+        # Fail only inside the rebuild, after products was renamed to products_old
+        if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_old'").fetchone():
+            raise RuntimeError("crash during rebuild")
+        create_products_table(self, cursor)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(GroceryDatabase, '_create_products_table', crash)
+        with pytest.raises(RuntimeError):
+            GroceryDatabase(path, verbose=False)
+    assert 'products_old' not in _tables(path)
+
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        assert len(db.get_all_products_df()) == len(LEGACY_ROWS)
+    finally:
+        db.close()
+
+
+def test_leftover_products_old_is_recovered(tmp_path):
+    """A rebuild interrupted by older code left the rows in products_old and an empty products"""
+    path = str(tmp_path / 'old.db')
+    _no_pincode_database(path)
+    conn = sqlite3.connect(path)
+    conn.execute('ALTER TABLE products RENAME TO products_old')
+    conn.execute('DROP INDEX idx_platform')
+    conn.execute('DROP INDEX idx_listing_date')
+    conn.execute('''
+        CREATE TABLE products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, platform TEXT NOT NULL, name TEXT NOT NULL,
+            price TEXT NOT NULL, price_numeric REAL, size TEXT, full_text_id INTEGER, url_id INTEGER,
+            pincode TEXT NOT NULL DEFAULT '', scrape_date TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(platform, name, price, scrape_date, pincode)
+        )
+    ''')
+    conn.commit()
+    conn.close()
+
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        assert len(db.get_all_products_df()) == len(LEGACY_ROWS)
+    finally:
+        db.close()
+    assert 'products_old' not in _tables(path)
+
+
+def test_csv_pincode_is_ingested_as_text(tmp_path):
+    csv_file = tmp_path / 'blinkit_141001_milk_results.csv'
+    csv_file.write_text('platform,name,price,pincode\n'
+                        'Blinkit,Amul Taaza Toned Milk,₹27,141001\n'
+                        'Blinkit,Amul Gold Milk,₹34,\n', encoding='utf-8')
+
+    db = GroceryDatabase(str(tmp_path / 'prices.db'), verbose=False)
+    try:
+        assert db.load_csv_to_database(str(csv_file))
+        rows = db.query_product_rows(pincode='141001')
+        unknown = db.query_product_rows(search_term='gold')
+    finally:
+        db.close()
+
+    assert [row['name'] for row in rows] == ['Amul Taaza Toned Milk']
+    assert rows[0]['pincode'] == '141001'
+    assert unknown[0]['pincode'] == ''
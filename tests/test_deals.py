@@ -0,0 +1,105 @@
+"""GroceryDatabase.find_deals checked against a plain pandas groupby"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grocery.database import GroceryDatabase
+
+PLATFORMS = ['Blinkit', 'Zepto', 'Swiggy Instamart']
+
+
+def _insert(db, rows):
+    db.conn.executemany('''
+        INSERT OR IGNORE INTO products (platform, name, price, price_numeric, pincode, scrape_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [(platform, name, f"₹{price}", price, pincode, day) for platform, name, price, pincode, day in rows])
+    db.conn.commit()
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Random catalog: name variants across platforms, several pincodes, dates and prices per day"""
+    rng = np.random.default_rng(1)
+    db = GroceryDatabase(str(tmp_path / 'prices.db'), verbose=False)
+    rows = []
+    for i in range(150):
+        spellings = [f"Amul Product {i}", f"amul product {i}", f"Amul Product {i}!"]
+        for platform in PLATFORMS:
+            if rng.random() < 0.3:
+                continue  # not sold here
+            name = spellings[rng.integers(len(spellings))]
+            for pincode in ('141001', '110001'):
+                for day in rng.choice(['2025-06-01', '2025-06-02', '2025-06-03'], size=rng.integers(1, 4)):
+                    for price in np.round(rng.uniform(5, 500, size=rng.integers(1, 3)), 2):
+                        rows.append((platform, name, float(price), pincode, str(day)))
+    _insert(db, rows)
+    yield db
+    db.close()
+
+
+def _expected(db, min_platforms, pincode=None):
+    """Deals the slow obvious way: latest day per listing, cheapest listing per platform"""
+    rows = pd.read_sql_query('SELECT platform, name, price_numeric, pincode, scrape_date FROM products', db.conn)
+    if pincode:
+        rows = rows[rows['pincode'] == pincode]
+    latest = rows.groupby(['platform', 'name'])['scrape_date'].transform('max')
+    listings = rows[rows['scrape_date'] == latest].groupby(['platform', 'name'], as_index=False)['price_numeric'].min()
+    listings['key'] = listings['name'].str.lower().str.replace(r'[^\w\s]', '', regex=True)
+    per_platform = listings.groupby(['key', 'platform'])['price_numeric'].min().reset_index()
+
+    expected = per_platform.groupby('key').agg(platforms=('platform', 'nunique'),
+                                               min_price=('price_numeric', 'min'),
+                                               max_price=('price_numeric', 'max'))
+    expected['listings'] = listings.groupby('key').size()
+    expected = expected[expected['platforms'] >= min_platforms]
+    expected['savings_percent'] = ((expected['max_price'] - expected['min_price'])
+                                   / expected['max_price'] * 100).round(1)
+    return expected, per_platform.set_index(['key', 'platform'])['price_numeric']
+
+
+@pytest.mark.parametrize('min_platforms, pincode', [(2, None), (3, None), (2, '141001')])
+def test_find_deals_matches_pandas(db, min_platforms, pincode):
+    deals = db.find_deals(limit=None, min_platforms=min_platforms, pincode=pincode)
+    expected, prices = _expected(db, min_platforms, pincode)
+
+    keys = deals['Product'].str.lower().str.replace(r'[^\w\s]', '', regex=True)
+    ours = deals.set_index(keys)
+    assert len(deals) > 10
+    assert sorted(ours.index) == sorted(expected.index)
+    expected = expected.loc[ours.index]
+    assert np.array_equal(ours['Listings'].to_numpy(), expected['listings'].to_numpy())
+    assert np.array_equal(ours['Platforms'].str.count(', ').to_numpy() + 1, expected['platforms'].to_numpy())
+    assert np.allclose(ours['Min Price'].to_numpy(), expected['min_price'].to_numpy())
+    assert np.allclose(ours['Max Price'].to_numpy(), expected['max_price'].to_numpy())
+    assert np.allclose(ours['Savings %'].to_numpy(), expected['savings_percent'].to_numpy())
+    # Best/worst platform are the ones whose cheapest listing gives the min/max price
+    best = prices.loc[list(zip(ours.index, ours['Best Platform']))].to_numpy()
+    worst = prices.loc[list(zip(ours.index, ours['Worst Platform']))].to_numpy()
+    assert np.allclose(best, ours['Min Price'].to_numpy()) and np.allclose(worst, ours['Max Price'].to_numpy())
+    # Sorted by savings percent as a number
+    assert (np.diff(ours['Savings %'].to_numpy()) <= 0).all()
+
+
+def test_find_deals_sorts_savings_numerically(tmp_path):
+    db = GroceryDatabase(str(tmp_path / 'prices.db'), verbose=False)
+    try:
+        _insert(db, [
+            ('Blinkit', 'Amul Butter', 100.0, '141001', '2025-06-01'),
+            ('Zepto', 'Amul Butter', 90.5, '141001', '2025-06-01'),       # 9.5%
+            ('Blinkit', 'Harvest Gold Bread', 50.0, '141001', '2025-06-01'),
+            ('Zepto', 'Harvest Gold Bread', 26.0, '141001', '2025-06-01'),  # 48.0%
+            ('Blinkit', 'Amul Ghee', 100.0, '141001', '2025-06-01'),
+            ('Zepto', 'Amul Ghee', 95.0, '141001', '2025-06-01'),         # 5.0%
+            # An older, cheaper Blinkit price is not the current one
+            ('Blinkit', 'Amul Ghee', 10.0, '141001', '2025-05-01'),
+        ])
+        deals = db.find_deals(limit=2)
+        single = db.find_deals(limit=None, min_platforms=1)
+    finally:
+        db.close()
+
+    assert list(deals['Savings %']) == [48.0, 9.5]
+    assert list(deals['Product']) == ['Harvest Gold Bread', 'Amul Butter']
+    assert list(deals['Best Platform']) == ['Zepto', 'Zepto']
+    assert list(single['Savings %']) == [48.0, 9.5, 5.0]
@@ -0,0 +1,120 @@
+"""ComparisonServer responses, exercised through respond() without sockets"""
+
+import asyncio
+import base64
+import gzip
+import json
+
+import pytest
+
+from grocery.database import GroceryDatabase
+from grocery.server import ComparisonServer
+
+
+def _load(path, tmp_path, filename, rows):
+    csv_file = tmp_path / filename
+    csv_file.write_text('platform,name,price,pincode\n'
+                        + ''.join(f'{platform},{name},₹{price},141001\n' for platform, name, price in rows),
+                        encoding='utf-8')
+    db = GroceryDatabase(path, verbose=False)
+    try:
+        assert db.load_csv_to_database(str(csv_file))
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Database file with 24 milk listings on two platforms"""
+    path = str(tmp_path / 'prices.db')
+    _load(path, tmp_path, 'milk_results.csv', [
+        (platform, f'Amul Milk {i:02d}', 20 + i) for platform in ('Blinkit', 'Zepto') for i in range(12)])
+    return path
+
+
+@pytest.fixture
+def server(path):
+    server = ComparisonServer(path, pool_size=2)
+    yield server
+    server.close()
+
+
+def get(server, target, accept_gzip=False, if_none_match=None):
+    return asyncio.run(server.respond(target, accept_gzip, if_none_match))
+
+
+def test_search_pages_follow_next_cursor(server):
+    seen = []
+    target = '/search?q=milk&limit=5'
+    pages = 0
+    while target:
+        status, _, body = get(server, target)
+        assert status == 200
+        page = json.loads(body)
+        seen.extend((item['platform'], item['name']) for item in page['items'])
+        pages += 1
+        target = page['next_cursor'] and f"/search?q=milk&limit=5&cursor={page['next_cursor']}"
+
+    assert pages == 5
+    assert seen == sorted((platform, f'Amul Milk {i:02d}') for platform in ('Blinkit', 'Zepto') for i in range(12))
+
+
+def test_matching_if_none_match_is_not_modified(server):
+    status, headers, body = get(server, '/search?q=milk&limit=2')
+    assert status == 200 and body
+
+    status, again, body = get(server, '/search?q=milk&limit=2', if_none_match=f'"other", {headers["ETag"]}')
+    assert status == 304 and body == b''
+    assert again['ETag'] == headers['ETag']
+
+    assert get(server, '/search?q=milk&limit=2', if_none_match='"other"')[0] == 200
+
+
+def test_ingest_changes_the_etag(server, path, tmp_path):
+    status, headers, _ = get(server, '/search?q=milk&platform=Zepto&limit=50')
+    assert status == 200
+
+    _load(path, tmp_path, 'butter_results.csv', [('Blinkit', 'Amul Butter Milk', 30)])
+    status, after, body = get(server, '/search?q=milk&platform=Zepto&limit=50', if_none_match=headers['ETag'])
+
+    assert status == 200
+    assert after['ETag'] != headers['ETag']
+    assert len(json.loads(body)['items']) == 12
+
+
+def test_gzip_has_its_own_etag(server):
+    status, plain, body = get(server, '/search?q=milk&limit=50')
+    status_gz, zipped, gz_body = get(server, '/search?q=milk&limit=50', accept_gzip=True)
+
+    assert status == status_gz == 200
+    assert zipped['Content-Encoding'] == 'gzip' and 'Content-Encoding' not in plain
+    assert zipped['ETag'] == plain['ETag'][:-1] + '-gz"'
+    assert gzip.decompress(gz_body) == body
+    # A tag for one representation does not validate the other
+    assert get(server, '/search?q=milk&limit=50', accept_gzip=True, if_none_match=plain['ETag'])[0] == 200
+    assert get(server, '/search?q=milk&limit=50', accept_gzip=True, if_none_match=zipped['ETag'])[0] == 304
+
+    # Small bodies are never compressed
+    _, small, _ = get(server, '/search?q=nothing', accept_gzip=True)
+    assert 'Content-Encoding' not in small and not small['ETag'].endswith('-gz"')
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('target', [
+    '/search?q=milk&cursor=not-base64!',
+    f'/search?q=milk&cursor={_cursor({"platform": "Zepto"})}',
+    f'/search?q=milk&cursor={_cursor(["Zepto", "Amul Milk 01"])}',
+    f'/history?name=Amul Milk 01&cursor={_cursor(["2025-06-14", 1, 2])}',
+    f'/search?q=milk&cursor={_cursor(["Zepto", None, 3])}',
+    '/search?q=milk&limit=0',
+    '/search?q=milk&limit=501',
+    '/search?q=milk&limit=ten',
+    '/deals?limit=-1',
+])
+def test_bad_cursor_or_limit_is_a_bad_request(server, target):
+    status, _, body = get(server, target)
+    assert status == 400
+    assert 'error' in json.loads(body)